@@ -1,16 +1,25 @@
 import os
+import atexit
 import sys
-import json
 import time
 import asyncio
 import sqlite3
 import logging
-import mimetypes
-from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Union, Any
+import threading
+import queue
+import zlib
+from bisect import bisect_right
+from collections import OrderedDict
+from operator import attrgetter
+from dataclasses import dataclass
+from functools import lru_cache
+from logging.handlers import QueueHandler, QueueListener
+from datetime import date, datetime, timedelta, timezone, time as dt_time
+from typing import List, Dict, Any, Optional, Tuple, Union
 
 # Third-party libraries
 import nest_asyncio
+import orjson
 from dotenv import load_dotenv
 from mcp.server.fastmcp import FastMCP
 from telethon import TelegramClient, functions, utils
@@ -23,51 +32,99 @@ from telethon.tl.types import (
     ChatBannedRights,
     ChannelParticipantsKicked,
     ChannelParticipantsAdmins,
-    InputChatPhoto,
     InputChatUploadedPhoto,
     InputChatPhotoEmpty,
-    InputPeerUser,
-    InputPeerChat,
-    InputPeerChannel,
+    InputPhoneContact,
+    InputPrivacyKeyChatInvite,
+    InputPrivacyKeyForwards,
+    InputPrivacyKeyPhoneCall,
+    InputPrivacyKeyPhoneNumber,
+    InputPrivacyKeyProfilePhoto,
+    InputPrivacyKeyStatusTimestamp,
+    InputPrivacyKeyVoiceMessages,
+    InputPrivacyValueAllowAll,
+    InputPrivacyValueAllowUsers,
+    InputPrivacyValueDisallowUsers,
+    Document,
+    PeerUser,
+    InputPeerNotifySettings,
+    InputMessagesFilterGif,
+    InputMessagesFilterPinned,
+    BotCommand,
+    BotCommandScopeDefault,
+    ChatInvite,
+    ChatInviteAlready,
+    InputFile,
+    InputFileBig,
 )
+from telethon.tl.types.messages import AllStickersNotModified
+from telethon.tl.types.contacts import ContactsNotModified
 import telethon.errors.rpcerrorlist
 
 
 def json_serializer(obj):
-    """Helper function to convert non-serializable objects for JSON serialization."""
-    if isinstance(obj, datetime):
-        return obj.isoformat()
+    """orjson fallback for types it cannot encode natively (datetimes never reach it)."""
     if isinstance(obj, bytes):
         return obj.decode("utf-8", errors="replace")
     # Add other non-serializable types as needed
     raise TypeError(f"Object of type {type(obj)} is not JSON serializable")
 
 
-load_dotenv()
+def format_json(obj) -> str:
+    """Serialize a tool result to compact JSON (datetimes handled natively).
+
+    Results go to an MCP client over stdio, not a terminal, so they are not pretty-printed.
+    """
+    return orjson.dumps(obj, default=json_serializer).decode()
+
 
-TELEGRAM_API_ID = int(os.getenv("TELEGRAM_API_ID"))
-TELEGRAM_API_HASH = os.getenv("TELEGRAM_API_HASH")
-TELEGRAM_SESSION_NAME = os.getenv("TELEGRAM_SESSION_NAME")
+@dataclass(frozen=True, slots=True)
+class Config:
+    """Telegram connection settings, read from the environment once at startup."""
+
+    api_id: int
+    api_hash: str
+    session_name: Optional[str]
+    session_string: Optional[str]
+
+    @classmethod
+    def from_env(cls) -> "Config":
+        return cls(
+            api_id=int(os.getenv("TELEGRAM_API_ID")),
+            api_hash=os.getenv("TELEGRAM_API_HASH"),
+            session_name=os.getenv("TELEGRAM_SESSION_NAME"),
+            # If a string session exists it takes precedence over the file-based session
+            session_string=os.getenv("TELEGRAM_SESSION_STRING") or None,
+        )
 
-# Check if a string session exists in environment, otherwise use file-based session
-SESSION_STRING = os.getenv("TELEGRAM_SESSION_STRING")
+    @property
+    def session(self) -> Union[StringSession, str]:
+        if self.session_string:
+            return StringSession(self.session_string)
+        return self.session_name
+
+
+load_dotenv()
+config = Config.from_env()
 
 mcp = FastMCP("telegram")
 
-if SESSION_STRING:
-    # Use the string session if available
-    client = TelegramClient(StringSession(SESSION_STRING), TELEGRAM_API_ID, TELEGRAM_API_HASH)
-else:
-    # Use file-based session
-    client = TelegramClient(TELEGRAM_SESSION_NAME, TELEGRAM_API_ID, TELEGRAM_API_HASH)
+# A single client is shared by every tool on purpose: Telethon's MTProto sender already
+# pipelines concurrent requests over one connection, and extra clients on the same
+# session would contend for the session file and split update state.
+client = TelegramClient(config.session, config.api_id, config.api_hash)
 
 # Setup robust logging with both file and console output
 logger = logging.getLogger("telegram_mcp")
-logger.setLevel(logging.ERROR)  # Set to ERROR for production, INFO for debugging
+# INFO so the startup messages reach stderr; the log file below still only keeps errors
+logger.setLevel(logging.INFO)
+# Our handlers below are the only output; don't also hand records to FastMCP's root handler
+logger.propagate = False
 
-# Create console handler
+# Create console handler (StreamHandler writes to stderr, keeping stdout free for the
+# MCP stdio transport)
 console_handler = logging.StreamHandler()
-console_handler.setLevel(logging.ERROR)  # Set to ERROR for production, INFO for debugging
+console_handler.setLevel(logging.INFO)
 
 # Create file handler with absolute path
 script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -84,16 +141,25 @@ try:
     console_handler.setFormatter(formatter)
     file_handler.setFormatter(formatter)
 
-    # Add handlers to logger
-    logger.addHandler(console_handler)
-    logger.addHandler(file_handler)
-
-    logger.info(f"Logging initialized to {log_file_path}")
+    log_handlers = [console_handler, file_handler]
+    log_setup_error = None
 except Exception as log_error:
-    print(f"WARNING: Error setting up log file: {log_error}")
     # Fallback to console-only logging
-    logger.addHandler(console_handler)
-    logger.error(f"Failed to set up log file handler: {log_error}")
+    log_handlers = [console_handler]
+    log_setup_error = log_error
+
+# Tools only enqueue records; a listener thread does the blocking stderr/file writes,
+# so logging an error burst never stalls the event loop.
+log_queue = queue.SimpleQueue()
+logger.addHandler(QueueHandler(log_queue))
+log_listener = QueueListener(log_queue, *log_handlers, respect_handler_level=True)
+log_listener.start()
+atexit.register(log_listener.stop)
+
+if log_setup_error is None:
+    logger.info("Logging initialized to %s", log_file_path)
+else:
+    logger.error("Failed to set up log file handler: %s", log_setup_error)
 
 # Error code prefix mapping for better error tracing
 ERROR_PREFIXES = {
@@ -123,6 +189,19 @@ def log_and_format_error(
     Returns:
         A user-friendly error message with error code
     """
+    # Format the additional context parameters
+    context = ", ".join(f"{k}={v}" for k, v in kwargs.items())
+
+    # Log the full technical error
+    logger.exception("%s failed (%s): %s", function_name, context, error)
+
+    # Return a user-friendly message
+    return _error_message(function_name, prefix)
+
+
+@lru_cache(maxsize=None)
+def _error_message(function_name: str, prefix: Optional[str]) -> str:
+    """Build the user-facing error string once per tool; later failures reuse it."""
     # Generate a consistent error code
     if prefix is None:
         # Try to derive prefix from function name
@@ -133,59 +212,433 @@ def log_and_format_error(
         if prefix is None:
             prefix = "GEN"  # Generic prefix if none matches
 
-    error_code = f"{prefix}-ERR-{abs(hash(function_name)) % 1000:03d}"
+    # crc32 rather than hash(): str hashes are salted per process, so codes would drift
+    error_code = f"{prefix}-ERR-{zlib.crc32(function_name.encode()) % 1000:03d}"
+    return f"An error occurred (code: {error_code}). Check mcp_errors.log for details."
 
-    # Format the additional context parameters
-    context = ", ".join(f"{k}={v}" for k, v in kwargs.items())
 
-    # Log the full technical error
-    logger.exception(f"{function_name} failed ({context}): {error}")
+# Entity class -> chat type; Channel is resolved separately (broadcast vs. supergroup)
+_ENTITY_TYPE = {User: "user", Chat: "group"}
 
-    # Return a user-friendly message
-    return f"An error occurred (code: {error_code}). Check mcp_errors.log for details."
 
+# User objects always carry these fields, so a C-level attrgetter can replace getattr defaults
+_contact_fields = attrgetter("id", "first_name", "last_name", "username", "phone")
+_user_names = attrgetter("first_name", "last_name")
 
-def format_entity(entity) -> Dict[str, Any]:
-    """Helper function to format entity information consistently."""
+
+def _format_user(user: User) -> Dict[str, Any]:
+    user_id, first_name, last_name, username, phone = _contact_fields(user)
+    result = {
+        "id": user_id,
+        "name": " ".join(part for part in (first_name, last_name) if part),
+        "type": "user",
+    }
+    if username:
+        result["username"] = username
+    if phone:
+        result["phone"] = phone
+    return result
+
+
+def _format_chat(chat: Chat) -> Dict[str, Any]:
+    return {"id": chat.id, "name": chat.title, "type": "group"}
+
+
+def _format_channel(channel: Channel) -> Dict[str, Any]:
+    return {"id": channel.id, "name": channel.title, "type": "channel"}
+
+
+def _format_generic(entity) -> Dict[str, Any]:
+    """Fallback for entity classes without a specialized formatter (e.g. ChatForbidden)."""
     result = {"id": entity.id}
 
-    if hasattr(entity, "title"):
-        result["name"] = entity.title
-        result["type"] = "group" if isinstance(entity, Chat) else "channel"
+    title = getattr(entity, "title", None)
+    if title is not None:
+        result["name"] = title
+        result["type"] = _ENTITY_TYPE.get(type(entity), "channel")
     elif hasattr(entity, "first_name"):
-        name_parts = []
-        if entity.first_name:
-            name_parts.append(entity.first_name)
-        if hasattr(entity, "last_name") and entity.last_name:
-            name_parts.append(entity.last_name)
-        result["name"] = " ".join(name_parts)
+        result["name"] = " ".join(
+            part for part in (entity.first_name, getattr(entity, "last_name", None)) if part
+        )
         result["type"] = "user"
-        if hasattr(entity, "username") and entity.username:
-            result["username"] = entity.username
-        if hasattr(entity, "phone") and entity.phone:
-            result["phone"] = entity.phone
+        username = getattr(entity, "username", None)
+        if username:
+            result["username"] = username
+        phone = getattr(entity, "phone", None)
+        if phone:
+            result["phone"] = phone
 
     return result
 
 
+_ENTITY_FORMATTERS = {User: _format_user, Chat: _format_chat, Channel: _format_channel}
+
+
+def format_entity(entity) -> Dict[str, Any]:
+    """Helper function to format entity information consistently."""
+    return _ENTITY_FORMATTERS.get(type(entity), _format_generic)(entity)
+
+
 def format_message(message) -> Dict[str, Any]:
     """Helper function to format message information consistently."""
+    from_id, media = message.from_id, message.media
     result = {
         "id": message.id,
-        "date": message.date.isoformat(),
+        "date": message.date,
         "text": message.message or "",
     }
 
-    if message.from_id:
-        result["from_id"] = utils.get_peer_id(message.from_id)
+    if from_id:
+        result["from_id"] = utils.get_peer_id(from_id)
 
-    if message.media:
+    if media:
         result["has_media"] = True
-        result["media_type"] = type(message.media).__name__
+        result["media_type"] = type(media).__name__
 
     return result
 
 
+def format_contact_line(user: User) -> str:
+    """Format a user as a one-line 'ID: ..., Name: ...' contact summary."""
+    user_id, first_name, last_name, username, phone = _contact_fields(user)
+    parts = [f"ID: {user_id}", f"Name: {first_name or ''} {last_name or ''}".strip()]
+    if username:
+        parts.append(f"Username: @{username}")
+    if phone:
+        parts.append(f"Phone: {phone}")
+    return ", ".join(parts)
+
+
+def sender_display_name(sender, full_name: bool = False) -> str:
+    """Name to show for a message sender: a user's first (or full) name, else a chat title."""
+    if isinstance(sender, User):
+        name = " ".join(n for n in _user_names(sender) if n) if full_name else sender.first_name
+    else:
+        name = getattr(sender, "title", None)
+    return name or "Unknown"
+
+
+def format_participant_line(user: User) -> str:
+    """Format a participant as 'ID: ..., Name: ...'."""
+    return f"ID: {user.id}, Name: {' '.join(name for name in _user_names(user) if name)}".rstrip()
+
+
+@lru_cache(maxsize=256)
+def parse_date_utc(value: str) -> datetime:
+    """Parse a YYYY-MM-DD string to midnight UTC; raises ValueError on bad input."""
+    return datetime.combine(date.fromisoformat(value), dt_time.min, tzinfo=timezone.utc)
+
+
+class TokenBucket:
+    """Async token bucket: acquire() waits until another request fits in the rate."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+# Paths that fan out many requests at once (batched lookups, bulk imports), every tool
+# that sends a message, and the admin/ban edits Telegram throttles hardest go through
+# these buckets, so concurrency never pushes the whole session into a long FLOOD_WAIT.
+request_bucket = TokenBucket(rate=20, burst=30)
+admin_bucket = TokenBucket(rate=1, burst=5)
+
+# The buckets bound the start rate; this bounds how many of those requests may be
+# outstanding at once when Telegram answers slowly. Short FLOOD_WAITs are already
+# slept through and retried by Telethon (client.flood_sleep_threshold).
+MAX_IN_FLIGHT_REQUESTS = 20
+in_flight_requests = asyncio.Semaphore(MAX_IN_FLIGHT_REQUESTS)
+
+
+async def rate_limited(request, bucket: TokenBucket = request_bucket):
+    """Send a raw Telegram request once the given bucket and the in-flight cap allow it."""
+    await bucket.acquire()
+    async with in_flight_requests:
+        return await client(request)
+
+
+# Small TTL LRU in front of client.get_entity, keyed by whatever the tool was given
+ENTITY_CACHE_TTL = 300  # seconds
+ENTITY_CACHE_MAX_SIZE = 1024
+_entity_cache: "OrderedDict[Any, Tuple[float, Any]]" = OrderedDict()
+_entity_fetches: Dict[Any, "asyncio.Future[Any]"] = {}
+
+
+async def resolve_entity(peer) -> Any:
+    """Resolve a chat/user ID or username, reusing recent results to skip the round-trip."""
+    now = time.monotonic()
+    cached = _entity_cache.get(peer)
+    if cached is not None and now - cached[0] < ENTITY_CACHE_TTL:
+        _entity_cache.move_to_end(peer)
+        return cached[1]
+
+    # Concurrent misses for the same peer share one in-flight lookup
+    fetch = _entity_fetches.get(peer)
+    if fetch is None:
+        fetch = asyncio.ensure_future(_fetch_entity(peer))
+        _entity_fetches[peer] = fetch
+        fetch.add_done_callback(lambda _: _entity_fetches.pop(peer, None))
+    return await asyncio.shield(fetch)
+
+
+async def _fetch_entity(peer) -> Any:
+    await request_bucket.acquire()
+    async with in_flight_requests:
+        entity = await client.get_entity(peer)
+    _entity_cache[peer] = (time.monotonic(), entity)
+    _entity_cache.move_to_end(peer)
+    while len(_entity_cache) > ENTITY_CACHE_MAX_SIZE:
+        _entity_cache.popitem(last=False)
+    return entity
+
+
+def invalidate_entity(peer) -> None:
+    """Drop a cached entity (call after changing its title, photo or membership)."""
+    _entity_cache.pop(peer, None)
+
+
+async def resolve_entities(peers) -> List[Any]:
+    """Resolve several peers concurrently; failed lookups are returned in place as exceptions."""
+    return await asyncio.gather(*(resolve_entity(peer) for peer in peers), return_exceptions=True)
+
+
+async def resolve_input_entities(peers) -> List[Any]:
+    """Like resolve_entities, but returns InputPeers, which known peers get from the session."""
+    return await asyncio.gather(
+        *(client.get_input_entity(peer) for peer in peers), return_exceptions=True
+    )
+
+
+# The logged-in user only changes through update_profile, so it is fetched once per session.
+_me: Optional[User] = None
+
+
+async def get_me_cached() -> User:
+    """Return our own User, fetching it from Telegram on first use."""
+    global _me
+    if _me is None:
+        _me = await client.get_me()
+    return _me
+
+
+def invalidate_me() -> None:
+    """Force the next get_me_cached() to refetch (call after editing our profile)."""
+    global _me
+    _me = None
+
+
+# Contact list cache shared by the contact tools. Besides the users themselves it keeps
+# parallel lists of pre-casefolded names/usernames and phones so searches are a flat scan.
+CONTACTS_CACHE_TTL = 60  # seconds
+_contacts_cache: Dict[str, Any] = {"fetched_at": None, "hash": 0}
+
+
+def telegram_ids_hash(ids: List[int]) -> int:
+    """Telegram's documented 64-bit cache hash over a sequence of ids, as a signed long."""
+    acc = 0
+    for value in ids:
+        acc ^= acc >> 21
+        acc ^= (acc << 35) & 0xFFFFFFFFFFFFFFFF
+        acc ^= acc >> 4
+        acc = (acc + value) & 0xFFFFFFFFFFFFFFFF
+    return acc - (1 << 64) if acc >= 1 << 63 else acc
+
+
+async def get_contacts_index() -> Dict[str, Any]:
+    """Return the cached contact index, refreshing it from Telegram when stale."""
+    fetched_at = _contacts_cache["fetched_at"]
+    if fetched_at is not None and time.monotonic() - fetched_at < CONTACTS_CACHE_TTL:
+        return _contacts_cache
+
+    # Passing the hash of the list we hold lets Telegram answer ContactsNotModified
+    # instead of resending every contact when nothing changed.
+    result = await client(functions.contacts.GetContactsRequest(hash=_contacts_cache["hash"]))
+    if isinstance(result, ContactsNotModified):
+        _contacts_cache["fetched_at"] = time.monotonic()
+        return _contacts_cache
+
+    users = [user for user in result.users if user]
+    contact_ids = sorted(contact.user_id for contact in result.contacts)
+    _contacts_cache["hash"] = telegram_ids_hash([result.saved_count, *contact_ids])
+    _contacts_cache.update(
+        fetched_at=time.monotonic(),
+        users=users,
+        names=[f"{u.first_name or ''} {u.last_name or ''}".casefold() for u in users],
+        usernames=[(u.username or "").casefold() for u in users],
+        phones=[u.phone or "" for u in users],
+    )
+    # One "\n"-separated blob of every searchable field lets match_contacts scan all
+    # contacts with a single str.find pass instead of three `in` checks per contact.
+    records = [
+        f"{name}\x00{username}\x00{phone}"
+        for name, username, phone in zip(
+            _contacts_cache["names"], _contacts_cache["usernames"], _contacts_cache["phones"]
+        )
+    ]
+    starts, offset = [], 0
+    for record in records:
+        starts.append(offset)
+        offset += len(record) + 1
+    _contacts_cache.update(haystack="\n".join(records), starts=starts)
+    return _contacts_cache
+
+
+def match_contacts(index: Dict[str, Any], query: str) -> List[Any]:
+    """Return contacts whose name, username or phone contains query (case-insensitive)."""
+    # casefold() once: handles non-ASCII names (e.g. "ß") that lower() misses
+    needle = query.casefold()
+    users = index["users"]
+    if not needle:
+        return list(users)
+    if "\n" in needle or "\x00" in needle:
+        return []
+
+    haystack, starts = index["haystack"], index["starts"]
+    matches = []
+    pos = haystack.find(needle)
+    while pos != -1:
+        i = bisect_right(starts, pos) - 1
+        matches.append(users[i])
+        if i + 1 == len(starts):
+            break
+        pos = haystack.find(needle, starts[i + 1])
+    return matches
+
+
+def invalidate_contacts_cache() -> None:
+    """Force the next contact lookup to refetch (call after changing contacts)."""
+    _contacts_cache["fetched_at"] = None
+
+
+# Short-lived on-disk cache of rendered get_chats/list_chats output, so repeated paging
+# does not refetch dialogs. Oldest rows are evicted first once the table is full. Keys
+# carry the account id, so a restart on a different session never sees another
+# account's chats. All SQLite work runs in a worker thread, off the event loop.
+CHAT_LIST_CACHE_TTL = 30  # seconds
+CHAT_LIST_CACHE_MAX_ROWS = 256
+chat_list_cache_path = os.path.join(script_dir, "chat_cache.sqlite")
+
+
+def _open_chat_list_cache() -> Optional[sqlite3.Connection]:
+    try:
+        conn = sqlite3.connect(chat_list_cache_path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS chats_cache (key TEXT PRIMARY KEY, ts REAL, payload TEXT)"
+        )
+        return conn
+    except sqlite3.Error as e:
+        logger.error("Chat list cache disabled: %s", e)
+        return None
+
+
+_chat_list_cache = _open_chat_list_cache()
+# Worker threads share the one connection; keep each statement/transaction whole
+_chat_list_cache_lock = threading.Lock()
+
+
+def _read_chat_list(key: str) -> Optional[str]:
+    with _chat_list_cache_lock:
+        row = _chat_list_cache.execute(
+            "SELECT payload FROM chats_cache WHERE key = ? AND ts > ?",
+            (key, time.time() - CHAT_LIST_CACHE_TTL),
+        ).fetchone()
+    return row[0] if row else None
+
+
+def _write_chat_list(key: str, payload: str) -> None:
+    with _chat_list_cache_lock, _chat_list_cache:
+        _chat_list_cache.execute(
+            "INSERT OR REPLACE INTO chats_cache (key, ts, payload) VALUES (?, ?, ?)",
+            (key, time.time(), payload),
+        )
+        _chat_list_cache.execute(
+            "DELETE FROM chats_cache WHERE key NOT IN "
+            "(SELECT key FROM chats_cache ORDER BY ts DESC LIMIT ?)",
+            (CHAT_LIST_CACHE_MAX_ROWS,),
+        )
+
+
+def _clear_chat_lists() -> None:
+    with _chat_list_cache_lock, _chat_list_cache:
+        _chat_list_cache.execute("DELETE FROM chats_cache")
+
+
+async def get_cached_chat_list(key: str) -> Optional[str]:
+    """Return a cached chat listing for key if it is younger than CHAT_LIST_CACHE_TTL."""
+    if _chat_list_cache is None:
+        return None
+    account_key = f"{(await get_me_cached()).id}|{key}"
+    return await asyncio.to_thread(_read_chat_list, account_key)
+
+
+async def store_chat_list(key: str, payload: str) -> None:
+    if _chat_list_cache is None:
+        return
+    account_key = f"{(await get_me_cached()).id}|{key}"
+    await asyncio.to_thread(_write_chat_list, account_key, payload)
+
+
+# In-memory dialog list shared by get_chats/list_chats; concurrent refreshes are coalesced
+DIALOGS_CACHE_TTL = 30  # seconds
+_dialogs_cache: Dict[str, Any] = {"fetched_at": None, "limit": None, "dialogs": []}
+_dialogs_lock = asyncio.Lock()
+
+
+async def get_dialogs_cached(limit: Optional[int] = None) -> list:
+    """Return up to limit dialogs (all if None), reusing a recent fetch that covers them."""
+
+    def covered() -> bool:
+        fetched_at = _dialogs_cache["fetched_at"]
+        if fetched_at is None or time.monotonic() - fetched_at >= DIALOGS_CACHE_TTL:
+            return False
+        cached_limit = _dialogs_cache["limit"]
+        return cached_limit is None or (limit is not None and limit <= cached_limit)
+
+    if not covered():
+        async with _dialogs_lock:
+            if not covered():
+                dialogs = await client.get_dialogs(limit=limit)
+                if limit is not None and len(dialogs) < limit:
+                    limit = None  # got every dialog the account has
+                _dialogs_cache.update(fetched_at=time.monotonic(), limit=limit, dialogs=dialogs)
+    return _dialogs_cache["dialogs"][:limit]
+
+
+async def invalidate_chat_list_cache() -> None:
+    """Drop all cached chat listings.
+
+    Call after any write that changes what get_chats/list_chats show: joining, leaving,
+    creating or renaming chats, sending, forwarding, deleting or reading messages
+    (dialog order and unread counts), archiving, and editing contacts (display names).
+
+    Best-effort: the write has already happened on Telegram, so a failing on-disk cache is
+    logged rather than turned into an error for the tool that called this.
+    """
+    _dialogs_cache["fetched_at"] = None
+    if _chat_list_cache is None:
+        return
+    try:
+        await asyncio.to_thread(_clear_chat_lists)
+    except Exception:
+        logger.exception("Failed to clear the chat list cache")
+
+
 @mcp.tool()
 async def get_chats(page: int = 1, page_size: int = 20) -> str:
     """
@@ -195,9 +648,14 @@ async def get_chats(page: int = 1, page_size: int = 20) -> str:
         page_size: Number of chats per page.
     """
     try:
-        dialogs = await client.get_dialogs()
+        cache_key = f"get_chats|{page}|{page_size}"
+        cached = await get_cached_chat_list(cache_key)
+        if cached is not None:
+            return cached
+
         start = (page - 1) * page_size
         end = start + page_size
+        dialogs = await get_dialogs_cached(end)
         if start >= len(dialogs):
             return "Page out of range."
         chats = dialogs[start:end]
@@ -207,7 +665,9 @@ async def get_chats(page: int = 1, page_size: int = 20) -> str:
             chat_id = entity.id
             title = getattr(entity, "title", None) or getattr(entity, "first_name", "Unknown")
             lines.append(f"Chat ID: {chat_id}, Title: {title}")
-        return "\n".join(lines)
+        output = "\n".join(lines)
+        await store_chat_list(cache_key, output)
+        return output
     except Exception as e:
         return log_and_format_error("get_chats", e)
 
@@ -222,14 +682,14 @@ async def get_messages(chat_id: int, page: int = 1, page_size: int = 20) -> str:
         page_size: Number of messages per page.
     """
     try:
-        entity = await client.get_entity(chat_id)
+        entity = await resolve_entity(chat_id)
         offset = (page - 1) * page_size
-        messages = await client.get_messages(entity, limit=page_size, add_offset=offset)
-        if not messages:
+        lines = [
+            f"ID: {msg.id} | Date: {msg.date} | Message: {msg.message}"
+            async for msg in client.iter_messages(entity, limit=page_size, add_offset=offset)
+        ]
+        if not lines:
             return "No messages found for this page."
-        lines = []
-        for msg in messages:
-            lines.append(f"ID: {msg.id} | Date: {msg.date} | Message: {msg.message}")
         return "\n".join(lines)
     except Exception as e:
         return log_and_format_error(
@@ -246,8 +706,10 @@ async def send_message(chat_id: int, message: str) -> str:
         message: The message content to send.
     """
     try:
-        entity = await client.get_entity(chat_id)
-        await client.send_message(entity, message)
+        await request_bucket.acquire()
+        # Writes only need the InputPeer, which comes from the session without a round-trip
+        await client.send_message(await client.get_input_entity(chat_id), message)
+        await invalidate_chat_list_cache()
         return "Message sent successfully."
     except Exception as e:
         return log_and_format_error("send_message", e, chat_id=chat_id)
@@ -259,26 +721,18 @@ async def list_contacts() -> str:
     List all contacts in your Telegram account.
     """
     try:
-        result = await client(functions.contacts.GetContactsRequest(hash=0))
-        users = result.users
+        users = (await get_contacts_index())["users"]
         if not users:
             return "No contacts found."
-        lines = []
-        for user in users:
-            name = f"{getattr(user, 'first_name', '')} {getattr(user, 'last_name', '')}".strip()
-            username = getattr(user, "username", "")
-            phone = getattr(user, "phone", "")
-            contact_info = f"ID: {user.id}, Name: {name}"
-            if username:
-                contact_info += f", Username: @{username}"
-            if phone:
-                contact_info += f", Phone: {phone}"
-            lines.append(contact_info)
-        return "\n".join(lines)
+        return "\n".join([format_contact_line(user) for user in users])
     except Exception as e:
         return log_and_format_error("list_contacts", e)
 
 
+# Shorter queries are answered from the cached contact list without a SearchRequest
+CONTACT_SEARCH_MIN_QUERY_LENGTH = 3
+
+
 @mcp.tool()
 async def search_contacts(query: str) -> str:
     """
@@ -287,22 +741,15 @@ async def search_contacts(query: str) -> str:
         query: The search term to look for in contact names, usernames, or phone numbers.
     """
     try:
-        result = await client(functions.contacts.SearchRequest(q=query, limit=50))
-        users = result.users
+        if len(query) < CONTACT_SEARCH_MIN_QUERY_LENGTH:
+            # Too short for a useful server search; match against the local contact list
+            users = match_contacts(await get_contacts_index(), query)
+        else:
+            result = await client(functions.contacts.SearchRequest(q=query, limit=50))
+            users = result.users
         if not users:
             return f"No contacts found matching '{query}'."
-        lines = []
-        for user in users:
-            name = f"{getattr(user, 'first_name', '')} {getattr(user, 'last_name', '')}".strip()
-            username = getattr(user, "username", "")
-            phone = getattr(user, "phone", "")
-            contact_info = f"ID: {user.id}, Name: {name}"
-            if username:
-                contact_info += f", Username: @{username}"
-            if phone:
-                contact_info += f", Phone: {phone}"
-            lines.append(contact_info)
-        return "\n".join(lines)
+        return "\n".join([format_contact_line(user) for user in users])
     except Exception as e:
         return log_and_format_error("search_contacts", e, query=query)
 
@@ -313,7 +760,7 @@ async def get_contact_ids() -> str:
     Get all contact IDs in your Telegram account.
     """
     try:
-        result = await client(functions.contacts.GetContactIDsRequest(hash=0))
+        result = [user.id for user in (await get_contacts_index())["users"]]
         if not result:
             return "No contact IDs found."
         return "Contact IDs: " + ", ".join(str(cid) for cid in result)
@@ -340,77 +787,44 @@ async def list_messages(
         to_date: Filter messages until this date (format: YYYY-MM-DD).
     """
     try:
-        entity = await client.get_entity(chat_id)
-
-        # Parse date filters if provided
+        # Parse date filters if provided (message dates are UTC-aware)
         from_date_obj = None
         to_date_obj = None
 
         if from_date:
             try:
-                from_date_obj = datetime.strptime(from_date, "%Y-%m-%d")
-                # Make it timezone aware by adding UTC timezone info
-                # Use datetime.timezone.utc for Python 3.9+ or import timezone directly for 3.13+
-                try:
-                    # For Python 3.9+
-                    from_date_obj = from_date_obj.replace(tzinfo=datetime.timezone.utc)
-                except AttributeError:
-                    # For Python 3.13+
-                    from datetime import timezone
-
-                    from_date_obj = from_date_obj.replace(tzinfo=timezone.utc)
+                from_date_obj = parse_date_utc(from_date)
             except ValueError:
                 return f"Invalid from_date format. Use YYYY-MM-DD."
 
         if to_date:
             try:
-                to_date_obj = datetime.strptime(to_date, "%Y-%m-%d")
-                # Set to end of day and make timezone aware
-                to_date_obj = to_date_obj + timedelta(days=1, microseconds=-1)
-                # Add timezone info
-                try:
-                    to_date_obj = to_date_obj.replace(tzinfo=datetime.timezone.utc)
-                except AttributeError:
-                    from datetime import timezone
-
-                    to_date_obj = to_date_obj.replace(tzinfo=timezone.utc)
+                # offset_date is exclusive, so the bound is midnight after to_date
+                to_date_obj = parse_date_utc(to_date) + timedelta(days=1)
             except ValueError:
                 return f"Invalid to_date format. Use YYYY-MM-DD."
 
-        # Prepare filter parameters
-        params = {}
-        if search_query:
-            params["search"] = search_query
-
-        messages = await client.get_messages(entity, limit=limit, **params)
-
-        # Apply date filters (Telethon doesn't support date filtering in get_messages directly)
-        if from_date_obj or to_date_obj:
-            filtered_messages = []
-            for msg in messages:
-                if from_date_obj and msg.date < from_date_obj:
-                    continue
-                if to_date_obj and msg.date > to_date_obj:
-                    continue
-                filtered_messages.append(msg)
-            messages = filtered_messages
-
-        if not messages:
-            return "No messages found matching the criteria."
+        entity = await resolve_entity(chat_id)
 
+        # Walk newest-to-oldest starting at to_date and stop once we cross from_date,
+        # so date filters never eat into the requested limit
         lines = []
-        for msg in messages:
+        async for msg in client.iter_messages(
+            entity, limit=limit, search=search_query, offset_date=to_date_obj
+        ):
+            if from_date_obj and msg.date < from_date_obj:
+                break
+            # Format as messages arrive rather than buffering them for a second pass
             sender = ""
             if msg.sender:
-                sender_name = getattr(msg.sender, "first_name", "") or getattr(
-                    msg.sender, "title", "Unknown"
-                )
-                sender = f"{sender_name} | "
+                sender = f"{sender_display_name(msg.sender)} | "
 
             lines.append(
                 f"ID: {msg.id} | {sender}Date: {msg.date} | Message: {msg.message or '[Media/No text]'}"
             )
 
+        if not lines:
+            return "No messages found matching the criteria."
         return "\n".join(lines)
     except Exception as e:
         return log_and_format_error("list_messages", e, chat_id=chat_id)
@@ -426,53 +840,59 @@ async def list_chats(chat_type: str = None, limit: int = 20) -> str:
         limit: Maximum number of chats to retrieve.
     """
     try:
-        dialogs = await client.get_dialogs(limit=limit)
+        cache_key = f"list_chats|{chat_type}|{limit}"
+        cached = await get_cached_chat_list(cache_key)
+        if cached is not None:
+            return cached
+
+        dialogs = await get_dialogs_cached(limit)
 
+        wanted_type = chat_type.lower() if chat_type else None
         results = []
         for dialog in dialogs:
             entity = dialog.entity
 
             # Filter by type if requested
-            current_type = None
-            if isinstance(entity, User):
-                current_type = "user"
-            elif isinstance(entity, Chat):
-                current_type = "group"
-            elif isinstance(entity, Channel):
-                if getattr(entity, "broadcast", False):
-                    current_type = "channel"
-                else:
-                    current_type = "group"  # Supergroup
+            current_type = _ENTITY_TYPE.get(type(entity))
+            if current_type is None and isinstance(entity, Channel):
+                # Supergroups are channels without the broadcast flag
+                current_type = "channel" if entity.broadcast else "group"
 
-            if chat_type and current_type != chat_type.lower():
+            if wanted_type and current_type != wanted_type:
                 continue
 
             # Format chat info
-            chat_info = f"Chat ID: {entity.id}"
-
-            if hasattr(entity, "title"):
-                chat_info += f", Title: {entity.title}"
-            elif hasattr(entity, "first_name"):
-                name = f"{entity.first_name}"
-                if hasattr(entity, "last_name") and entity.last_name:
-                    name += f" {entity.last_name}"
-                chat_info += f", Name: {name}"
+            parts = [f"Chat ID: {entity.id}"]
+
+            title = getattr(entity, "title", None)
+            first_name = getattr(entity, "first_name", None)
+            if title is not None:
+                parts.append(f"Title: {title}")
+            elif first_name is not None:
+                last_name = getattr(entity, "last_name", None)
+                parts.append(
+                    f"Name: {first_name} {last_name}" if last_name else f"Name: {first_name}"
+                )
 
-            chat_info += f", Type: {current_type}"
+            parts.append(f"Type: {current_type}")
 
-            if hasattr(entity, "username") and entity.username:
-                chat_info += f", Username: @{entity.username}"
+            username = getattr(entity, "username", None)
+            if username:
+                parts.append(f"Username: @{username}")
 
             # Add unread count if available
-            if hasattr(dialog, "unread_count") and dialog.unread_count > 0:
-                chat_info += f", Unread: {dialog.unread_count}"
+            unread_count = getattr(dialog, "unread_count", 0)
+            if unread_count > 0:
+                parts.append(f"Unread: {unread_count}")
 
-            results.append(chat_info)
+            results.append(", ".join(parts))
 
         if not results:
             return f"No chats found matching the criteria."
 
-        return "\n".join(results)
+        output = "\n".join(results)
+        await store_chat_list(cache_key, output)
+        return output
     except Exception as e:
         return log_and_format_error("list_chats", e, chat_type=chat_type, limit=limit)
 
@@ -486,7 +906,7 @@ async def get_chat(chat_id: int) -> str:
         chat_id: The ID of the chat.
     """
     try:
-        entity = await client.get_entity(chat_id)
+        entity = await resolve_entity(chat_id)
 
         result = []
         result.append(f"ID: {entity.id}")
@@ -530,26 +950,25 @@ async def get_chat(chat_id: int) -> str:
 
         # Get last activity if it's a dialog
         try:
-            # Using get_dialogs might be slow if there are many dialogs
-            # Alternative: Get entity again via get_dialogs if needed for unread count
-            dialog = await client.get_dialogs(limit=1, offset_id=0, offset_peer=entity)
-            if dialog:
-                dialog = dialog[0]
+            # Ask for exactly this peer's dialog instead of paging through get_dialogs
+            peer_dialogs = await client(functions.messages.GetPeerDialogsRequest(peers=[entity]))
+            if peer_dialogs.dialogs:
+                dialog = peer_dialogs.dialogs[0]
                 result.append(f"Unread Messages: {dialog.unread_count}")
-                if dialog.message:
-                    last_msg = dialog.message
-                    sender_name = "Unknown"
-                    if last_msg.sender:
-                        sender_name = getattr(last_msg.sender, "first_name", "") or getattr(
-                            last_msg.sender, "title", "Unknown"
-                        )
-                        if hasattr(last_msg.sender, "last_name") and last_msg.sender.last_name:
-                            sender_name += f" {last_msg.sender.last_name}"
-                    sender_name = sender_name.strip() or "Unknown"
+                last_msg = next(
+                    (m for m in peer_dialogs.messages if m.id == dialog.top_message), None
+                )
+                if last_msg:
+                    senders = {
+                        utils.get_peer_id(e): e for e in peer_dialogs.users + peer_dialogs.chats
+                    }
+                    sender_name = sender_display_name(
+                        senders.get(last_msg.sender_id), full_name=True
+                    )
                     result.append(f"Last Message: From {sender_name} at {last_msg.date}")
                     result.append(f"Message: {last_msg.message or '[Media/No text]'}")
         except Exception as diag_ex:
-            logger.warning(f"Could not get dialog info for {chat_id}: {diag_ex}")
+            logger.warning("Could not get dialog info for %s: %s", chat_id, diag_ex)
             pass
 
         return "\n".join(result)
@@ -557,6 +976,10 @@ async def get_chat(chat_id: int) -> str:
         return log_and_format_error("get_chat", e, chat_id=chat_id)
 
 
+# Upper bound on peers sent in a single messages.GetPeerDialogsRequest
+PEER_DIALOGS_BATCH_SIZE = 100
+
+
 @mcp.tool()
 async def get_direct_chat_by_contact(contact_query: str) -> str:
     """
@@ -566,45 +989,42 @@ async def get_direct_chat_by_contact(contact_query: str) -> str:
         contact_query: Name, username, or phone number to search for.
     """
     try:
-        # Fetch all contacts using the correct Telethon method
-        result = await client(functions.contacts.GetContactsRequest(hash=0))
-        contacts = result.users
-        found_contacts = []
-        for contact in contacts:
-            if not contact:
-                continue
-            name = (
-                f"{getattr(contact, 'first_name', '')} {getattr(contact, 'last_name', '')}".strip()
-            )
-            username = getattr(contact, "username", "")
-            phone = getattr(contact, "phone", "")
-            if (
-                contact_query.lower() in name.lower()
-                or (username and contact_query.lower() in username.lower())
-                or (phone and contact_query in phone)
-            ):
-                found_contacts.append(contact)
+        found_contacts = match_contacts(await get_contacts_index(), contact_query)
         if not found_contacts:
             return f"No contacts found matching '{contact_query}'."
         # If we found contacts, look for direct chats with them
+        # Ask GetPeerDialogs for just these users instead of scanning every dialog
         results = []
-        dialogs = await client.get_dialogs()
-        for contact in found_contacts:
-            contact_name = (
-                f"{getattr(contact, 'first_name', '')} {getattr(contact, 'last_name', '')}".strip()
+        batches = await asyncio.gather(
+            *(
+                rate_limited(
+                    functions.messages.GetPeerDialogsRequest(
+                        peers=found_contacts[i : i + PEER_DIALOGS_BATCH_SIZE]
+                    )
+                )
+                for i in range(0, len(found_contacts), PEER_DIALOGS_BATCH_SIZE)
             )
-            for dialog in dialogs:
-                if isinstance(dialog.entity, User) and dialog.entity.id == contact.id:
-                    chat_info = f"Chat ID: {dialog.entity.id}, Contact: {contact_name}"
-                    if getattr(contact, "username", ""):
-                        chat_info += f", Username: @{contact.username}"
-                    if dialog.unread_count:
-                        chat_info += f", Unread: {dialog.unread_count}"
-                    results.append(chat_info)
-                    break
+        )
+        dialog_by_user_id = {
+            dialog.peer.user_id: dialog
+            for batch in batches
+            for dialog in batch.dialogs
+            if isinstance(dialog.peer, PeerUser) and dialog.top_message
+        }
+        for contact in found_contacts:
+            dialog = dialog_by_user_id.get(contact.id)
+            if dialog is None:
+                continue
+            contact_name = " ".join(name for name in _user_names(contact) if name)
+            parts = [f"Chat ID: {contact.id}", f"Contact: {contact_name}"]
+            if contact.username:
+                parts.append(f"Username: @{contact.username}")
+            if dialog.unread_count:
+                parts.append(f"Unread: {dialog.unread_count}")
+            results.append(", ".join(parts))
         if not results:
             found_names = ", ".join(
-                [f"{c.first_name} {c.last_name}".strip() for c in found_contacts]
+                " ".join(name for name in _user_names(c) if name) for c in found_contacts
             )
             return f"Found contacts: {found_names}, but no direct chats were found with them."
         return "\n".join(results)
@@ -622,39 +1042,42 @@ async def get_contact_chats(contact_id: int) -> str:
     """
     try:
         # Get contact info
-        contact = await client.get_entity(contact_id)
+        contact = await resolve_entity(contact_id)
         if not isinstance(contact, User):
             return f"ID {contact_id} is not a user/contact."
 
-        contact_name = (
-            f"{getattr(contact, 'first_name', '')} {getattr(contact, 'last_name', '')}".strip()
-        )
-
-        # Find direct chat
-        direct_chat = None
-        dialogs = await client.get_dialogs()
+        contact_name = " ".join(name for name in _user_names(contact) if name)
 
         results = []
 
+        # The direct-chat dialog and the common chats are independent; fetch them together
+        peer_dialogs, common = await asyncio.gather(
+            client(functions.messages.GetPeerDialogsRequest(peers=[contact])),
+            client(functions.messages.GetCommonChatsRequest(user_id=contact, max_id=0, limit=100)),
+            return_exceptions=True,
+        )
+        if isinstance(peer_dialogs, BaseException):
+            raise peer_dialogs
+        # Only Telegram errors are downgraded below; cancellation must still propagate
+        if isinstance(common, BaseException) and not isinstance(common, Exception):
+            raise common
+
         # Look for direct chat
-        for dialog in dialogs:
-            if isinstance(dialog.entity, User) and dialog.entity.id == contact_id:
-                chat_info = f"Direct Chat ID: {dialog.entity.id}, Type: Private"
-                if dialog.unread_count:
-                    chat_info += f", Unread: {dialog.unread_count}"
-                results.append(chat_info)
-                break
+        dialog = peer_dialogs.dialogs[0] if peer_dialogs.dialogs else None
+        if dialog and dialog.top_message:
+            chat_info = f"Direct Chat ID: {contact.id}, Type: Private"
+            if dialog.unread_count:
+                chat_info += f", Unread: {dialog.unread_count}"
+            results.append(chat_info)
 
         # Look for common groups/channels
-        common_chats = []
-        try:
-            common = await client.get_common_chats(contact)
-            for chat in common:
-                chat_type = "Channel" if getattr(chat, "broadcast", False) else "Group"
-                chat_info = f"Chat ID: {chat.id}, Title: {chat.title}, Type: {chat_type}"
-                results.append(chat_info)
-        except:
+        if isinstance(common, Exception):
+            logger.warning("GetCommonChats failed for %s: %s", contact_id, common)
             results.append("Could not retrieve common groups.")
+        else:
+            for chat in common.chats:
+                chat_type = "Channel" if getattr(chat, "broadcast", False) else "Group"
+                results.append(f"Chat ID: {chat.id}, Title: {chat.title}, Type: {chat_type}")
 
         if not results:
             return f"No chats found with {contact_name} (ID: {contact_id})."
@@ -674,13 +1097,11 @@ async def get_last_interaction(contact_id: int) -> str:
     """
     try:
         # Get contact info
-        contact = await client.get_entity(contact_id)
+        contact = await resolve_entity(contact_id)
         if not isinstance(contact, User):
             return f"ID {contact_id} is not a user/contact."
 
-        contact_name = (
-            f"{getattr(contact, 'first_name', '')} {getattr(contact, 'last_name', '')}".strip()
-        )
+        contact_name = " ".join(name for name in _user_names(contact) if name)
 
         # Get the last few messages
         messages = await client.get_messages(contact, limit=5)
@@ -711,18 +1132,18 @@ async def get_message_context(chat_id: int, message_id: int, context_size: int =
         context_size: Number of messages before and after to include.
     """
     try:
-        chat = await client.get_entity(chat_id)
-        # Get messages around the specified message
-        messages_before = await client.get_messages(chat, limit=context_size, max_id=message_id)
-        central_message = await client.get_messages(chat, ids=message_id)
+        chat = await resolve_entity(chat_id)
+        # Get messages around the specified message (the three fetches are independent)
+        messages_before, central_message, messages_after = await asyncio.gather(
+            client.get_messages(chat, limit=context_size, max_id=message_id),
+            client.get_messages(chat, ids=message_id),
+            client.get_messages(chat, limit=context_size, min_id=message_id, reverse=True),
+        )
         # Fix: get_messages(ids=...) returns a single Message, not a list
         if central_message is not None and not isinstance(central_message, list):
             central_message = [central_message]
         elif central_message is None:
             central_message = []
-        messages_after = await client.get_messages(
-            chat, limit=context_size, min_id=message_id, reverse=True
-        )
         if not central_message:
             return f"Message with ID {message_id} not found in chat {chat_id}."
         # Combine messages in chronological order
@@ -730,11 +1151,7 @@ async def get_message_context(chat_id: int, message_id: int, context_size: int =
         all_messages.sort(key=lambda m: m.id)
         results = [f"Context for message {message_id} in chat {chat_id}:"]
         for msg in all_messages:
-            sender_name = "Unknown"
-            if msg.sender:
-                sender_name = getattr(msg.sender, "first_name", "") or getattr(
-                    msg.sender, "title", "Unknown"
-                )
+            sender_name = sender_display_name(msg.sender)
             highlight = " [THIS MESSAGE]" if msg.id == message_id else ""
             results.append(
                 f"ID: {msg.id} | {sender_name} | {msg.date}{highlight}\n{msg.message or '[Media/No text]'}\n"
@@ -760,9 +1177,6 @@ async def add_contact(phone: str, first_name: str, last_name: str = "") -> str:
         last_name: The contact's last name (optional).
     """
     try:
-        # Try to import the required types first
-        from telethon.tl.types import InputPhoneContact
-
         result = await client(
             functions.contacts.ImportContactsRequest(
                 contacts=[
@@ -773,6 +1187,8 @@ async def add_contact(phone: str, first_name: str, last_name: str = "") -> str:
             )
         )
         if result.imported:
+            invalidate_contacts_cache()
+            await invalidate_chat_list_cache()
             return f"Contact {first_name} {last_name} added successfully."
         else:
             return f"Contact not added. Response: {str(result)}"
@@ -792,17 +1208,81 @@ async def add_contact(phone: str, first_name: str, last_name: str = "") -> str:
                 )
             )
             if hasattr(result, "imported") and result.imported:
+                invalidate_contacts_cache()
+                await invalidate_chat_list_cache()
                 return f"Contact {first_name} {last_name} added successfully (alt method)."
             else:
                 return f"Contact not added. Alternative method response: {str(result)}"
         except Exception as alt_e:
-            logger.exception(f"add_contact (alt method) failed (phone={phone})")
+            logger.exception("add_contact (alt method) failed (phone=%s)", phone)
             return log_and_format_error("add_contact", alt_e, phone=phone)
     except Exception as e:
-        logger.exception(f"add_contact failed (phone={phone})")
+        logger.exception("add_contact failed (phone=%s)", phone)
         return log_and_format_error("add_contact", e, phone=phone)
 
 
+# delete_contact calls arriving within this window share one DeleteContactsRequest
+CONTACT_DELETE_BATCH_WINDOW = 0.02  # seconds
+_pending_contact_deletes: List[Tuple[Any, asyncio.Future]] = []
+_contact_delete_flushes: set = set()
+
+
+async def _flush_contact_deletes() -> None:
+    batch: List[Tuple[Any, asyncio.Future]] = []
+    outcomes: List[Any] = []
+    try:
+        await asyncio.sleep(CONTACT_DELETE_BATCH_WINDOW)
+        batch = _pending_contact_deletes[:]
+        _pending_contact_deletes.clear()
+        users = [user for user, _ in batch]
+        try:
+            await client(functions.contacts.DeleteContactsRequest(id=users))
+            outcomes = [None] * len(batch)
+        except Exception as e:
+            if len(batch) == 1:
+                outcomes = [e]
+            else:
+                # One bad user fails the whole request; retry individually so the rest succeed
+                outcomes = await asyncio.gather(
+                    *(
+                        rate_limited(functions.contacts.DeleteContactsRequest(id=[u]))
+                        for u in users
+                    ),
+                    return_exceptions=True,
+                )
+    except BaseException as e:
+        # Cancelled or failed before every outcome was known; callers must not wait forever
+        if not batch:
+            batch = _pending_contact_deletes[:]
+            _pending_contact_deletes.clear()
+        outcomes = [e] * len(batch)
+        raise
+    finally:
+        invalidate_contacts_cache()
+        for (_, future), outcome in zip(batch, outcomes):
+            if future.done():
+                continue
+            if isinstance(outcome, asyncio.CancelledError):
+                future.cancel()
+            elif isinstance(outcome, BaseException):
+                future.set_exception(outcome)
+            else:
+                future.set_result(None)
+    # Only after the callers are released; invalidation failures are logged, not raised
+    await invalidate_chat_list_cache()
+
+
+async def delete_contact_batched(user) -> None:
+    """Delete a contact, coalescing concurrent deletions into a single request."""
+    future = asyncio.get_running_loop().create_future()
+    _pending_contact_deletes.append((user, future))
+    if len(_pending_contact_deletes) == 1:
+        task = asyncio.create_task(_flush_contact_deletes())
+        _contact_delete_flushes.add(task)
+        task.add_done_callback(_contact_delete_flushes.discard)
+    await future
+
+
 @mcp.tool()
 async def delete_contact(user_id: int) -> str:
     """
@@ -811,8 +1291,8 @@ async def delete_contact(user_id: int) -> str:
         user_id: The Telegram user ID of the contact to delete.
     """
     try:
-        user = await client.get_entity(user_id)
-        await client(functions.contacts.DeleteContactsRequest(id=[user]))
+        user = await client.get_input_entity(user_id)
+        await delete_contact_batched(user)
         return f"Contact with user ID {user_id} deleted."
     except Exception as e:
         return log_and_format_error("delete_contact", e, user_id=user_id)
@@ -826,7 +1306,7 @@ async def block_user(user_id: int) -> str:
         user_id: The Telegram user ID to block.
     """
     try:
-        user = await client.get_entity(user_id)
+        user = await client.get_input_entity(user_id)
         await client(functions.contacts.BlockRequest(id=user))
         return f"User {user_id} blocked."
     except Exception as e:
@@ -841,7 +1321,7 @@ async def unblock_user(user_id: int) -> str:
         user_id: The Telegram user ID to unblock.
     """
     try:
-        user = await client.get_entity(user_id)
+        user = await client.get_input_entity(user_id)
         await client(functions.contacts.UnblockRequest(id=user))
         return f"User {user_id} unblocked."
     except Exception as e:
@@ -854,8 +1334,7 @@ async def get_me() -> str:
     Get your own user information.
     """
     try:
-        me = await client.get_me()
-        return json.dumps(format_entity(me), indent=2)
+        return format_json(format_entity(await get_me_cached()))
     except Exception as e:
         return log_and_format_error("get_me", e)
 
@@ -870,15 +1349,13 @@ async def create_group(title: str, user_ids: list) -> str:
         user_ids: List of user IDs to add to the group
     """
     try:
-        # Convert user IDs to entities
+        # Convert user IDs to entities (resolved concurrently)
         users = []
-        for user_id in user_ids:
-            try:
-                user = await client.get_entity(user_id)
-                users.append(user)
-            except Exception as e:
-                logger.error(f"Failed to get entity for user ID {user_id}: {e}")
+        for user_id, user in zip(user_ids, await resolve_entities(user_ids)):
+            if isinstance(user, BaseException):
+                logger.error("Failed to get entity for user ID %s: %s", user_id, user)
                 return f"Error: Could not find user with ID {user_id}"
+            users.append(user)
 
         if not users:
             return "Error: No valid users provided"
@@ -887,6 +1364,7 @@ async def create_group(title: str, user_ids: list) -> str:
         try:
             # Create a new chat with selected users
             result = await client(functions.messages.CreateChatRequest(users=users, title=title))
+            await invalidate_chat_list_cache()
 
             # Check what type of response we got
             if hasattr(result, "chats") and result.chats:
@@ -914,10 +1392,13 @@ async def create_group(title: str, user_ids: list) -> str:
             else:
                 raise  # Let the outer exception handler catch it
     except Exception as e:
-        logger.exception(f"create_group failed (title={title}, user_ids={user_ids})")
+        logger.exception("create_group failed (title=%s, user_ids=%s)", title, user_ids)
         return log_and_format_error("create_group", e, title=title, user_ids=user_ids)
 
 
+BASIC_GROUP_ADD_CONCURRENCY = 5
+
+
 @mcp.tool()
 async def invite_to_group(group_id: int, user_ids: list) -> str:
     """
@@ -928,17 +1409,42 @@ async def invite_to_group(group_id: int, user_ids: list) -> str:
         user_ids: List of user IDs to invite.
     """
     try:
-        entity = await client.get_entity(group_id)
+        # Resolve the group and all users concurrently
+        entity, users = await asyncio.gather(resolve_entity(group_id), resolve_entities(user_ids))
         users_to_add = []
 
-        for user_id in user_ids:
-            try:
-                user = await client.get_entity(user_id)
-                users_to_add.append(user)
-            except ValueError as e:
-                return f"Error: User with ID {user_id} could not be found. {e}"
+        for user_id, user in zip(user_ids, users):
+            if isinstance(user, ValueError):
+                return f"Error: User with ID {user_id} could not be found. {user}"
+            if isinstance(user, BaseException):
+                raise user
+            users_to_add.append(user)
 
         try:
+            if isinstance(entity, Chat):
+                # Basic groups have no bulk invite; add users concurrently, a few at a time
+                semaphore = asyncio.Semaphore(BASIC_GROUP_ADD_CONCURRENCY)
+
+                async def add_user(user):
+                    async with semaphore:
+                        return await client(
+                            functions.messages.AddChatUserRequest(
+                                chat_id=entity.id, user_id=user, fwd_limit=100
+                            )
+                        )
+
+                outcomes = await asyncio.gather(
+                    *(add_user(user) for user in users_to_add), return_exceptions=True
+                )
+                failures = [o for o in outcomes if isinstance(o, Exception)]
+                if failures and len(failures) == len(outcomes):
+                    raise failures[0]
+                for err in failures:
+                    logger.error("invite_to_group could not add a user to %s: %s", group_id, err)
+                return (
+                    f"Successfully invited {len(outcomes) - len(failures)} users to {entity.title}"
+                )
+
             result = await client(
                 functions.channels.InviteToChannelRequest(channel=entity, users=users_to_add)
             )
@@ -961,7 +1467,9 @@ async def invite_to_group(group_id: int, user_ids: list) -> str:
 
     except Exception as e:
         logger.error(
-            f"telegram_mcp invite_to_group failed (group_id={group_id}, user_ids={user_ids})",
+            "telegram_mcp invite_to_group failed (group_id=%s, user_ids=%s)",
+            group_id,
+            user_ids,
             exc_info=True,
         )
         return log_and_format_error("invite_to_group", e, group_id=group_id, user_ids=user_ids)
@@ -976,13 +1484,15 @@ async def leave_chat(chat_id: int) -> str:
         chat_id: The chat ID to leave.
     """
     try:
-        entity = await client.get_entity(chat_id)
+        entity = await resolve_entity(chat_id)
 
         # Check the entity type carefully
         if isinstance(entity, Channel):
             # Handle both channels and supergroups (which are also channels in Telegram)
             try:
                 await client(functions.channels.LeaveChannelRequest(channel=entity))
+                await invalidate_chat_list_cache()
+                invalidate_entity(chat_id)
                 chat_name = getattr(entity, "title", str(chat_id))
                 return f"Left channel/supergroup {chat_name} (ID: {chat_id})."
             except Exception as chan_err:
@@ -998,22 +1508,26 @@ async def leave_chat(chat_id: int) -> str:
                         chat_id=entity.id, user_id=me  # Use the entity ID directly
                     )
                 )
+                await invalidate_chat_list_cache()
+                invalidate_entity(chat_id)
                 chat_name = getattr(entity, "title", str(chat_id))
                 return f"Left basic group {chat_name} (ID: {chat_id})."
             except Exception as chat_err:
                 # If the above fails, try the second approach
                 logger.warning(
-                    f"First leave attempt failed: {chat_err}, trying alternative method"
+                    "First leave attempt failed: %s, trying alternative method", chat_err
                 )
 
                 try:
                     # Alternative approach - sometimes this works better
-                    me_full = await client.get_me()
+                    me_full = await get_me_cached()
                     await client(
                         functions.messages.DeleteChatUserRequest(
                             chat_id=entity.id, user_id=me_full.id
                         )
                     )
+                    await invalidate_chat_list_cache()
+                    invalidate_entity(chat_id)
                     chat_name = getattr(entity, "title", str(chat_id))
                     return f"Left basic group {chat_name} (ID: {chat_id})."
                 except Exception as alt_err:
@@ -1030,7 +1544,7 @@ async def leave_chat(chat_id: int) -> str:
             )
 
     except Exception as e:
-        logger.exception(f"leave_chat failed (chat_id={chat_id})")
+        logger.exception("leave_chat failed (chat_id=%s)", chat_id)
 
         # Provide helpful hint for common errors
         error_str = str(e).lower()
@@ -1047,21 +1561,96 @@ async def leave_chat(chat_id: int) -> str:
 
 
 @mcp.tool()
-async def get_participants(chat_id: int) -> str:
+async def get_participants(chat_id: int, limit: int = 1000) -> str:
     """
-    List all participants in a group or channel.
+    List participants in a group or channel.
     Args:
         chat_id: The group or channel ID.
+        limit: Maximum number of participants to return.
     """
     try:
-        participants = await client.get_participants(chat_id)
+        # Format each page as it arrives instead of materializing the full member list
+        # (iter_participants only yields Users, so the name fields are always present)
         lines = [
-            f"ID: {p.id}, Name: {getattr(p, 'first_name', '')} {getattr(p, 'last_name', '')}"
-            for p in participants
+            f"ID: {p.id}, Name: {p.first_name or ''} {p.last_name or ''}"
+            async for p in client.iter_participants(chat_id, limit=limit)
         ]
         return "\n".join(lines)
     except Exception as e:
-        return log_and_format_error("get_participants", e, chat_id=chat_id)
+        return log_and_format_error("get_participants", e, chat_id=chat_id, limit=limit)
+
+
+async def check_readable_file(path: str) -> Optional[str]:
+    """Return "missing" or "unreadable" for a bad upload path, else None.
+
+    The stat calls run in a worker thread so a slow filesystem cannot stall the event loop.
+    """
+
+    def check() -> Optional[str]:
+        if not os.path.isfile(path):
+            return "missing"
+        if not os.access(path, os.R_OK):
+            return "unreadable"
+        return None
+
+    return await asyncio.to_thread(check)
+
+
+# Telethon's upload_file/iter_download wait for each 512 KB part before requesting the
+# next, so a transfer is capped at one part per round-trip. These helpers keep several
+# parts in flight instead; memory stays bounded by TRANSFER_CONCURRENCY parts.
+TRANSFER_PART_SIZE = 512 * 1024  # Telegram's maximum part size
+TRANSFER_CONCURRENCY = 8
+# Below this size the file is a couple of parts at most and Telethon's own path is as fast
+PARALLEL_UPLOAD_MIN_SIZE = 10 * 1024 * 1024
+
+
+def _read_part(path: str, offset: int) -> bytes:
+    with open(path, "rb") as f:
+        f.seek(offset)
+        return f.read(TRANSFER_PART_SIZE)
+
+
+class EmptyFileError(ValueError):
+    """Raised by upload_file_parallel for a 0-byte file, which Telegram rejects."""
+
+
+async def upload_file_parallel(file_path: str) -> Union[InputFile, InputFileBig]:
+    """Upload a local file with several parts in flight, reading them in worker threads."""
+    file_size = await asyncio.to_thread(os.path.getsize, file_path)
+    if not file_size:
+        raise EmptyFileError(f"Cannot upload an empty file: {file_path}")
+    part_count = (file_size + TRANSFER_PART_SIZE - 1) // TRANSFER_PART_SIZE
+    # Telegram wants the "big file" requests above 10 MB, as Telethon's upload_file does
+    is_big = file_size > 10 * 1024 * 1024
+    file_id = int.from_bytes(os.urandom(8), "big", signed=True)
+    semaphore = asyncio.Semaphore(TRANSFER_CONCURRENCY)
+
+    async def save_part(index: int) -> None:
+        async with semaphore:
+            data = await asyncio.to_thread(_read_part, file_path, index * TRANSFER_PART_SIZE)
+            if is_big:
+                request = functions.upload.SaveBigFilePartRequest(
+                    file_id=file_id, file_part=index, file_total_parts=part_count, bytes=data
+                )
+            else:
+                request = functions.upload.SaveFilePartRequest(
+                    file_id=file_id, file_part=index, bytes=data
+                )
+            if not await client(request):
+                raise RuntimeError(f"Failed to upload file part {index}.")
+
+    await asyncio.gather(*(save_part(index) for index in range(part_count)))
+
+    file_name = os.path.basename(file_path)
+    if is_big:
+        return InputFileBig(id=file_id, parts=part_count, name=file_name)
+    # The checksum is optional; computing it would need a second, sequential pass
+    return InputFile(id=file_id, parts=part_count, name=file_name, md5_checksum="")
+
+
+# Ogg containers Telegram plays as voice notes (.oga is the audio-only Ogg extension)
+VOICE_EXTENSIONS = frozenset({".ogg", ".oga", ".opus"})
 
 
 @mcp.tool()
@@ -1074,12 +1663,28 @@ async def send_file(chat_id: int, file_path: str, caption: str = None) -> str:
         caption: Optional caption for the file.
     """
     try:
-        if not os.path.isfile(file_path):
+        problem = await check_readable_file(file_path)
+        if problem == "missing":
             return f"File not found: {file_path}"
-        if not os.access(file_path, os.R_OK):
+        if problem == "unreadable":
             return f"File is not readable: {file_path}"
-        entity = await client.get_entity(chat_id)
-        await client.send_file(entity, file_path, caption=caption)
+        entity = await client.get_input_entity(chat_id)
+        file_size = await asyncio.to_thread(os.path.getsize, file_path)
+        await request_bucket.acquire()
+        # Photos stay on Telethon's path, which may need to resize them before upload
+        if file_size < PARALLEL_UPLOAD_MIN_SIZE or utils.is_image(file_path):
+            await client.send_file(entity, file_path, caption=caption)
+        else:
+            # A pre-uploaded file carries only its name, so derive the media attributes
+            # (duration, dimensions, ...) from the path as send_file would have
+            uploaded, (attributes, mime_type) = await asyncio.gather(
+                upload_file_parallel(file_path),
+                asyncio.to_thread(utils.get_attributes, file_path),
+            )
+            await client.send_file(
+                entity, uploaded, caption=caption, attributes=attributes, mime_type=mime_type
+            )
+        await invalidate_chat_list_cache()
         return f"File sent to chat {chat_id}."
     except Exception as e:
         return log_and_format_error(
@@ -1087,6 +1692,51 @@ async def send_file(chat_id: int, file_path: str, caption: str = None) -> str:
         )
 
 
+def _write_chunk_at(fd: int, offset: int, data: bytes) -> None:
+    # pwrite is positional, so download workers in different threads need no shared seek
+    view = memoryview(data)
+    while view:
+        written = os.pwrite(fd, view, offset)
+        view = view[written:]
+        offset += written
+
+
+async def stream_document(document, file_path: str) -> None:
+    """Download a document to file_path in large chunks, doing disk I/O off the event loop."""
+    fd = await asyncio.to_thread(os.open, file_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        if document.size and hasattr(os, "posix_fallocate"):
+            try:
+                # Reserve the space up front so the file is laid out contiguously
+                await asyncio.to_thread(os.posix_fallocate, fd, 0, document.size)
+            except OSError:
+                pass  # Not supported by every filesystem; writing still works
+        part_count = (document.size + TRANSFER_PART_SIZE - 1) // TRANSFER_PART_SIZE
+        workers = max(1, min(TRANSFER_CONCURRENCY, part_count))
+
+        async def download_stripe(first: int) -> int:
+            # Worker `first` fetches parts first, first + workers, ... (iter_download's stride)
+            offset, end = first * TRANSFER_PART_SIZE, 0
+            async for chunk in client.iter_download(
+                document,
+                offset=offset,
+                stride=workers * TRANSFER_PART_SIZE,
+                limit=len(range(first, part_count, workers)),
+                request_size=TRANSFER_PART_SIZE,
+                file_size=document.size,
+            ):
+                await asyncio.to_thread(_write_chunk_at, fd, offset, chunk)
+                end = offset + len(chunk)
+                offset += workers * TRANSFER_PART_SIZE
+            return end
+
+        ends = await asyncio.gather(*(download_stripe(first) for first in range(workers)))
+        # Drop any preallocated tail if the server sent less than advertised
+        await asyncio.to_thread(os.ftruncate, fd, max(ends))
+    finally:
+        await asyncio.to_thread(os.close, fd)
+
+
 @mcp.tool()
 async def download_media(chat_id: int, message_id: int, file_path: str) -> str:
     """
@@ -1097,16 +1747,19 @@ async def download_media(chat_id: int, message_id: int, file_path: str) -> str:
         file_path: Absolute path to save the downloaded file (must be writable).
     """
     try:
-        entity = await client.get_entity(chat_id)
-        msg = await client.get_messages(entity, ids=message_id)
+        entity = await client.get_input_entity(chat_id)
+        msg = await get_message_batched(entity, message_id)
         if not msg or not msg.media:
             return "No media found in the specified message."
         # Check if directory is writable
         dir_path = os.path.dirname(file_path) or "."
-        if not os.access(dir_path, os.W_OK):
+        if not await asyncio.to_thread(os.access, dir_path, os.W_OK):
             return f"Directory not writable: {dir_path}"
-        await client.download_media(msg, file=file_path)
-        if not os.path.isfile(file_path):
+        if isinstance(getattr(msg.media, "document", None), Document):
+            await stream_document(msg.media.document, file_path)
+        else:
+            await client.download_media(msg, file=file_path)
+        if not await asyncio.to_thread(os.path.isfile, file_path):
             return f"Download failed: file not created at {file_path}"
         return f"Media downloaded to {file_path}."
     except Exception as e:
@@ -1126,6 +1779,7 @@ async def update_profile(first_name: str = None, last_name: str = None, about: s
                 first_name=first_name, last_name=last_name, about=about
             )
         )
+        invalidate_me()
         return "Profile updated."
     except Exception as e:
         return log_and_format_error(
@@ -1133,16 +1787,32 @@ async def update_profile(first_name: str = None, last_name: str = None, about: s
         )
 
 
+# The photo set_profile_photo just uploaded is the current one, so a delete that follows
+# soon after can skip looking it up. Another client may change the photo meanwhile, so
+# keep the window short
+PROFILE_PHOTO_CACHE_TTL = 60  # seconds
+_profile_photo: Optional[Tuple[float, Any]] = None
+
+
 @mcp.tool()
 async def set_profile_photo(file_path: str) -> str:
     """
     Set a new profile photo.
     """
+    global _profile_photo
     try:
-        await client(
-            functions.photos.UploadProfilePhotoRequest(file=await client.upload_file(file_path))
+        problem = await check_readable_file(file_path)
+        if problem == "missing":
+            return f"Photo file not found: {file_path}"
+        if problem == "unreadable":
+            return f"Photo file not readable: {file_path}"
+        result = await client(
+            functions.photos.UploadProfilePhotoRequest(file=await upload_file_parallel(file_path))
         )
+        _profile_photo = (time.monotonic(), result.photo)
         return "Profile photo updated."
+    except EmptyFileError as e:
+        return str(e)
     except Exception as e:
         return log_and_format_error("set_profile_photo", e, file_path=file_path)
 
@@ -1151,28 +1821,52 @@ async def set_profile_photo(file_path: str) -> str:
 async def delete_profile_photo() -> str:
     """
     Delete your current profile photo.
-    """
-    try:
+
+    Within PROFILE_PHOTO_CACHE_TTL (60 s) of set_profile_photo this deletes the photo this
+    server last set, even if another client has set a newer one since. If that photo is
+    already gone, the current one is looked up and deleted instead.
+    """
+    global _profile_photo
+    try:
+        photo = None
+        if _profile_photo and time.monotonic() - _profile_photo[0] < PROFILE_PHOTO_CACHE_TTL:
+            photo = _profile_photo[1]
+        # The previous photo, if any, becomes current; look it up again next time. Cleared
+        # up front so a failed delete does not keep trusting the cached photo either
+        _profile_photo = None
+        # DeletePhotos needs the InputPhoto (id + access hash), not just the bare id, and
+        # returns the ids it actually deleted
+        if photo is not None and await client(functions.photos.DeletePhotosRequest(id=[photo])):
+            return "Profile photo deleted."
         photos = await client(
             functions.photos.GetUserPhotosRequest(user_id="me", offset=0, max_id=0, limit=1)
         )
         if not photos.photos:
             return "No profile photo to delete."
-        await client(functions.photos.DeletePhotosRequest(id=[photos.photos[0].id]))
+        await client(functions.photos.DeletePhotosRequest(id=[photos.photos[0]]))
         return "Profile photo deleted."
     except Exception as e:
         return log_and_format_error("delete_profile_photo", e)
 
 
+# Simplified privacy key names accepted by set_privacy_settings
+PRIVACY_KEYS = {
+    "status": InputPrivacyKeyStatusTimestamp,
+    "phone": InputPrivacyKeyPhoneNumber,
+    "profile_photo": InputPrivacyKeyProfilePhoto,
+    "forwards": InputPrivacyKeyForwards,
+    "calls": InputPrivacyKeyPhoneCall,
+    "chat_invite": InputPrivacyKeyChatInvite,
+    "voice_messages": InputPrivacyKeyVoiceMessages,
+}
+
+
 @mcp.tool()
 async def get_privacy_settings() -> str:
     """
     Get your privacy settings for last seen status.
     """
     try:
-        # Import needed types directly
-        from telethon.tl.types import InputPrivacyKeyStatusTimestamp
-
         try:
             settings = await client(
                 functions.account.GetPrivacyRequest(key=InputPrivacyKeyStatusTimestamp())
@@ -1196,75 +1890,46 @@ async def set_privacy_settings(
     Set privacy settings (e.g., last seen, phone, etc.).
 
     Args:
-        key: The privacy setting to modify ('status' for last seen, 'phone', 'profile_photo', etc.)
+        key: The privacy setting to modify ('status' for last seen, 'phone', 'profile_photo',
+            'forwards', 'calls', 'chat_invite' or 'voice_messages')
         allow_users: List of user IDs to allow
         disallow_users: List of user IDs to disallow
     """
     try:
-        # Import needed types
-        from telethon.tl.types import (
-            InputPrivacyKeyStatusTimestamp,
-            InputPrivacyKeyPhoneNumber,
-            InputPrivacyKeyProfilePhoto,
-            InputPrivacyValueAllowUsers,
-            InputPrivacyValueDisallowUsers,
-            InputPrivacyValueAllowAll,
-            InputPrivacyValueDisallowAll,
-        )
-
-        # Map the simplified keys to their corresponding input types
-        key_mapping = {
-            "status": InputPrivacyKeyStatusTimestamp,
-            "phone": InputPrivacyKeyPhoneNumber,
-            "profile_photo": InputPrivacyKeyProfilePhoto,
-        }
+        if key not in PRIVACY_KEYS:
+            return f"Error: Unsupported privacy key '{key}'. Supported keys: {', '.join(PRIVACY_KEYS)}"
 
-        # Get the appropriate key class
-        if key not in key_mapping:
-            return f"Error: Unsupported privacy key '{key}'. Supported keys: {', '.join(key_mapping.keys())}"
+        privacy_key = PRIVACY_KEYS[key]()
 
-        privacy_key = key_mapping[key]()
+        # Resolve allowed and disallowed users together from the session's stored access
+        # hashes instead of fetching every full User. The rules hold Vector<InputUser>, and
+        # Telethon does not convert peers nested inside them, so map each InputPeerUser here
+        allow_users = allow_users or []
+        disallow_users = disallow_users or []
+        user_ids = allow_users + disallow_users
+        resolved = await resolve_input_entities(user_ids)
+        for i, (user_id, user) in enumerate(zip(user_ids, resolved)):
+            if not isinstance(user, Exception):
+                try:
+                    user = resolved[i] = utils.get_input_user(user)
+                except TypeError as e:
+                    user = resolved[i] = e
+            if isinstance(user, Exception):
+                logger.warning("Could not get entity for user ID %s: %s", user_id, user)
+        allow_entities = [u for u in resolved[: len(allow_users)] if not isinstance(u, Exception)]
+        disallow_entities = [
+            u for u in resolved[len(allow_users) :] if not isinstance(u, Exception)
+        ]
 
         # Prepare the rules
         rules = []
-
-        # Process allow rules
-        if allow_users is None or len(allow_users) == 0:
+        if not allow_users:
             # If no specific users to allow, allow everyone by default
             rules.append(InputPrivacyValueAllowAll())
-        else:
-            # Convert user IDs to InputUser entities
-            try:
-                allow_entities = []
-                for user_id in allow_users:
-                    try:
-                        user = await client.get_entity(user_id)
-                        allow_entities.append(user)
-                    except Exception as user_err:
-                        logger.warning(f"Could not get entity for user ID {user_id}: {user_err}")
-
-                if allow_entities:
-                    rules.append(InputPrivacyValueAllowUsers(users=allow_entities))
-            except Exception as allow_err:
-                logger.error(f"Error processing allowed users: {allow_err}")
-                return log_and_format_error("set_privacy_settings", allow_err, key=key)
-
-        # Process disallow rules
-        if disallow_users and len(disallow_users) > 0:
-            try:
-                disallow_entities = []
-                for user_id in disallow_users:
-                    try:
-                        user = await client.get_entity(user_id)
-                        disallow_entities.append(user)
-                    except Exception as user_err:
-                        logger.warning(f"Could not get entity for user ID {user_id}: {user_err}")
-
-                if disallow_entities:
-                    rules.append(InputPrivacyValueDisallowUsers(users=disallow_entities))
-            except Exception as disallow_err:
-                logger.error(f"Error processing disallowed users: {disallow_err}")
-                return log_and_format_error("set_privacy_settings", disallow_err, key=key)
+        elif allow_entities:
+            rules.append(InputPrivacyValueAllowUsers(users=allow_entities))
+        if disallow_entities:
+            rules.append(InputPrivacyValueDisallowUsers(users=disallow_entities))
 
         # Apply the privacy settings
         try:
@@ -1278,10 +1943,26 @@ async def set_privacy_settings(
             else:
                 raise
     except Exception as e:
-        logger.exception(f"set_privacy_settings failed (key={key})")
+        logger.exception("set_privacy_settings failed (key=%s)", key)
         return log_and_format_error("set_privacy_settings", e, key=key)
 
 
+# Large imports are split into chunks so one oversized request cannot trip a flood wait
+# for the whole list; a few chunks are in flight at once.
+IMPORT_CONTACTS_BATCH_SIZE = 500
+IMPORT_CONTACTS_CONCURRENCY = 4
+
+
+async def _import_contacts_chunk(chunk: list, semaphore: asyncio.Semaphore):
+    async with semaphore:
+        try:
+            return await rate_limited(functions.contacts.ImportContactsRequest(contacts=chunk))
+        except telethon.errors.rpcerrorlist.FloodWaitError as e:
+            # Longer than Telethon's automatic flood sleep; wait it out and retry once
+            await asyncio.sleep(e.seconds)
+            return await rate_limited(functions.contacts.ImportContactsRequest(contacts=chunk))
+
+
 @mcp.tool()
 async def import_contacts(contacts: list) -> str:
     """
@@ -1289,7 +1970,7 @@ async def import_contacts(contacts: list) -> str:
     """
     try:
         input_contacts = [
-            functions.contacts.InputPhoneContact(
+            InputPhoneContact(
                 client_id=i,
                 phone=c["phone"],
                 first_name=c["first_name"],
@@ -1297,8 +1978,34 @@ async def import_contacts(contacts: list) -> str:
             )
             for i, c in enumerate(contacts)
         ]
-        result = await client(functions.contacts.ImportContactsRequest(contacts=input_contacts))
-        return f"Imported {len(result.imported)} contacts."
+        semaphore = asyncio.Semaphore(IMPORT_CONTACTS_CONCURRENCY)
+        results = await asyncio.gather(
+            *(
+                _import_contacts_chunk(
+                    input_contacts[i : i + IMPORT_CONTACTS_BATCH_SIZE], semaphore
+                )
+                for i in range(0, len(input_contacts), IMPORT_CONTACTS_BATCH_SIZE)
+            ),
+            return_exceptions=True,
+        )
+        invalidate_contacts_cache()
+        await invalidate_chat_list_cache()
+
+        imported = 0
+        failed_chunks = []
+        for result in results:
+            if isinstance(result, Exception):
+                failed_chunks.append(result)
+            else:
+                imported += len(result.imported)
+        if results and len(failed_chunks) == len(results):
+            return log_and_format_error("import_contacts", failed_chunks[0], contacts=contacts)
+        for err in failed_chunks:
+            logger.error("import_contacts chunk failed: %s", err)
+        message = f"Imported {imported} contacts."
+        if failed_chunks:
+            message += f" {len(failed_chunks)} batch(es) failed; see mcp_errors.log."
+        return message
     except Exception as e:
         return log_and_format_error("import_contacts", e, contacts=contacts)
 
@@ -1309,9 +2016,8 @@ async def export_contacts() -> str:
     Export all contacts as a JSON string.
     """
     try:
-        result = await client(functions.contacts.GetContactsRequest(hash=0))
-        users = result.users
-        return json.dumps([format_entity(u) for u in users], indent=2)
+        index = await get_contacts_index()
+        return format_json(list(map(format_entity, index["users"])))
     except Exception as e:
         return log_and_format_error("export_contacts", e)
 
@@ -1323,7 +2029,7 @@ async def get_blocked_users() -> str:
     """
     try:
         result = await client(functions.contacts.GetBlockedRequest(offset=0, limit=100))
-        return json.dumps([format_entity(u) for u in result.users], indent=2)
+        return format_json(list(map(format_entity, result.users)))
     except Exception as e:
         return log_and_format_error("get_blocked_users", e)
 
@@ -1337,6 +2043,7 @@ async def create_channel(title: str, about: str = "", megagroup: bool = False) -
         result = await client(
             functions.channels.CreateChannelRequest(title=title, about=about, megagroup=megagroup)
         )
+        await invalidate_chat_list_cache()
         return f"Channel '{title}' created with ID: {result.chats[0].id}"
     except Exception as e:
         return log_and_format_error(
@@ -1350,16 +2057,18 @@ async def edit_chat_title(chat_id: int, title: str) -> str:
     Edit the title of a chat, group, or channel.
     """
     try:
-        entity = await client.get_entity(chat_id)
+        entity = await resolve_entity(chat_id)
         if isinstance(entity, Channel):
             await client(functions.channels.EditTitleRequest(channel=entity, title=title))
         elif isinstance(entity, Chat):
             await client(functions.messages.EditChatTitleRequest(chat_id=chat_id, title=title))
         else:
             return f"Cannot edit title for this entity type ({type(entity)})."
+        invalidate_entity(chat_id)
+        await invalidate_chat_list_cache()
         return f"Chat {chat_id} title updated to '{title}'."
     except Exception as e:
-        logger.exception(f"edit_chat_title failed (chat_id={chat_id}, title='{title}')")
+        logger.exception("edit_chat_title failed (chat_id=%s, title=%r)", chat_id, title)
         return log_and_format_error("edit_chat_title", e, chat_id=chat_id, title=title)
 
 
@@ -1369,13 +2078,17 @@ async def edit_chat_photo(chat_id: int, file_path: str) -> str:
     Edit the photo of a chat, group, or channel. Requires a file path to an image.
     """
     try:
-        if not os.path.isfile(file_path):
+        problem = await check_readable_file(file_path)
+        if problem == "missing":
             return f"Photo file not found: {file_path}"
-        if not os.access(file_path, os.R_OK):
+        if problem == "unreadable":
             return f"Photo file not readable: {file_path}"
 
-        entity = await client.get_entity(chat_id)
-        uploaded_file = await client.upload_file(file_path)
+        # upload_file(path) would read the image on the event loop; the parallel upload
+        # reads its parts in worker threads
+        entity, uploaded_file = await asyncio.gather(
+            resolve_entity(chat_id), upload_file_parallel(file_path)
+        )
 
         if isinstance(entity, Channel):
             # For channels/supergroups, use EditPhotoRequest with InputChatUploadedPhoto
@@ -1390,9 +2103,12 @@ async def edit_chat_photo(chat_id: int, file_path: str) -> str:
         else:
             return f"Cannot edit photo for this entity type ({type(entity)})."
 
+        invalidate_entity(chat_id)
         return f"Chat {chat_id} photo updated."
+    except EmptyFileError as e:
+        return str(e)
     except Exception as e:
-        logger.exception(f"edit_chat_photo failed (chat_id={chat_id}, file_path='{file_path}')")
+        logger.exception("edit_chat_photo failed (chat_id=%s, file_path=%r)", chat_id, file_path)
         return log_and_format_error("edit_chat_photo", e, chat_id=chat_id, file_path=file_path)
 
 
@@ -1402,7 +2118,7 @@ async def delete_chat_photo(chat_id: int) -> str:
     Delete the photo of a chat, group, or channel.
     """
     try:
-        entity = await client.get_entity(chat_id)
+        entity = await resolve_entity(chat_id)
         if isinstance(entity, Channel):
             # Use InputChatPhotoEmpty for channels/supergroups
             await client(
@@ -1418,12 +2134,44 @@ async def delete_chat_photo(chat_id: int) -> str:
         else:
             return f"Cannot delete photo for this entity type ({type(entity)})."
 
+        invalidate_entity(chat_id)
         return f"Chat {chat_id} photo deleted."
     except Exception as e:
-        logger.exception(f"delete_chat_photo failed (chat_id={chat_id})")
+        logger.exception("delete_chat_photo failed (chat_id=%s)", chat_id)
         return log_and_format_error("delete_chat_photo", e, chat_id=chat_id)
 
 
+# Rights granted by promote_admin when none are given (everything but adding admins)
+DEFAULT_ADMIN_RIGHTS = ChatAdminRights(
+    change_info=True,
+    post_messages=True,
+    edit_messages=True,
+    delete_messages=True,
+    ban_users=True,
+    invite_users=True,
+    pin_messages=True,
+    add_admins=False,
+    anonymous=False,
+    manage_call=True,
+    other=True,
+)
+
+# Rights used by demote_admin (regular user)
+NO_ADMIN_RIGHTS = ChatAdminRights(
+    change_info=False,
+    post_messages=False,
+    edit_messages=False,
+    delete_messages=False,
+    ban_users=False,
+    invite_users=False,
+    pin_messages=False,
+    add_admins=False,
+    anonymous=False,
+    manage_call=False,
+    other=False,
+)
+
+
 @mcp.tool()
 async def promote_admin(group_id: int, user_id: int, rights: dict = None) -> str:
     """
@@ -1435,44 +2183,32 @@ async def promote_admin(group_id: int, user_id: int, rights: dict = None) -> str
         rights: Admin rights to give (optional)
     """
     try:
-        chat = await client.get_entity(group_id)
-        user = await client.get_entity(user_id)
+        chat, user = await asyncio.gather(resolve_entity(group_id), resolve_entity(user_id))
 
-        # Set default admin rights if not provided
+        # Use the default admin rights if not provided
         if not rights:
-            rights = {
-                "change_info": True,
-                "post_messages": True,
-                "edit_messages": True,
-                "delete_messages": True,
-                "ban_users": True,
-                "invite_users": True,
-                "pin_messages": True,
-                "add_admins": False,
-                "anonymous": False,
-                "manage_call": True,
-                "other": True,
-            }
-
-        admin_rights = ChatAdminRights(
-            change_info=rights.get("change_info", True),
-            post_messages=rights.get("post_messages", True),
-            edit_messages=rights.get("edit_messages", True),
-            delete_messages=rights.get("delete_messages", True),
-            ban_users=rights.get("ban_users", True),
-            invite_users=rights.get("invite_users", True),
-            pin_messages=rights.get("pin_messages", True),
-            add_admins=rights.get("add_admins", False),
-            anonymous=rights.get("anonymous", False),
-            manage_call=rights.get("manage_call", True),
-            other=rights.get("other", True),
-        )
+            admin_rights = DEFAULT_ADMIN_RIGHTS
+        else:
+            admin_rights = ChatAdminRights(
+                change_info=rights.get("change_info", True),
+                post_messages=rights.get("post_messages", True),
+                edit_messages=rights.get("edit_messages", True),
+                delete_messages=rights.get("delete_messages", True),
+                ban_users=rights.get("ban_users", True),
+                invite_users=rights.get("invite_users", True),
+                pin_messages=rights.get("pin_messages", True),
+                add_admins=rights.get("add_admins", False),
+                anonymous=rights.get("anonymous", False),
+                manage_call=rights.get("manage_call", True),
+                other=rights.get("other", True),
+            )
 
         try:
-            result = await client(
+            result = await rate_limited(
                 functions.channels.EditAdminRequest(
                     channel=chat, user_id=user, admin_rights=admin_rights, rank="Admin"
-                )
+                ),
+                admin_bucket,
             )
             return f"Successfully promoted user {user_id} to admin in {chat.title}"
         except telethon.errors.rpcerrorlist.UserNotMutualContactError:
@@ -1482,7 +2218,9 @@ async def promote_admin(group_id: int, user_id: int, rights: dict = None) -> str
 
     except Exception as e:
         logger.error(
-            f"telegram_mcp promote_admin failed (group_id={group_id}, user_id={user_id})",
+            "telegram_mcp promote_admin failed (group_id=%s, user_id=%s)",
+            group_id,
+            user_id,
             exc_info=True,
         )
         return log_and_format_error("promote_admin", e, group_id=group_id, user_id=user_id)
@@ -1498,29 +2236,14 @@ async def demote_admin(group_id: int, user_id: int) -> str:
         user_id: User ID to demote
     """
     try:
-        chat = await client.get_entity(group_id)
-        user = await client.get_entity(user_id)
-
-        # Create empty admin rights (regular user)
-        admin_rights = ChatAdminRights(
-            change_info=False,
-            post_messages=False,
-            edit_messages=False,
-            delete_messages=False,
-            ban_users=False,
-            invite_users=False,
-            pin_messages=False,
-            add_admins=False,
-            anonymous=False,
-            manage_call=False,
-            other=False,
-        )
+        chat, user = await asyncio.gather(resolve_entity(group_id), resolve_entity(user_id))
 
         try:
-            result = await client(
+            result = await rate_limited(
                 functions.channels.EditAdminRequest(
-                    channel=chat, user_id=user, admin_rights=admin_rights, rank=""
-                )
+                    channel=chat, user_id=user, admin_rights=NO_ADMIN_RIGHTS, rank=""
+                ),
+                admin_bucket,
             )
             return f"Successfully demoted user {user_id} from admin in {chat.title}"
         except telethon.errors.rpcerrorlist.UserNotMutualContactError:
@@ -1530,12 +2253,49 @@ async def demote_admin(group_id: int, user_id: int) -> str:
 
     except Exception as e:
         logger.error(
-            f"telegram_mcp demote_admin failed (group_id={group_id}, user_id={user_id})",
+            "telegram_mcp demote_admin failed (group_id=%s, user_id=%s)",
+            group_id,
+            user_id,
             exc_info=True,
         )
         return log_and_format_error("demote_admin", e, group_id=group_id, user_id=user_id)
 
 
+# Banned rights used by ban_user/ban_users (all restrictions enabled, forever)
+BAN_RIGHTS = ChatBannedRights(
+    until_date=None,
+    view_messages=True,
+    send_messages=True,
+    send_media=True,
+    send_stickers=True,
+    send_gifs=True,
+    send_games=True,
+    send_inline=True,
+    embed_links=True,
+    send_polls=True,
+    change_info=True,
+    invite_users=True,
+    pin_messages=True,
+)
+
+# Rights used by unban_user (no restrictions)
+UNBAN_RIGHTS = ChatBannedRights(
+    until_date=None,
+    view_messages=False,
+    send_messages=False,
+    send_media=False,
+    send_stickers=False,
+    send_gifs=False,
+    send_games=False,
+    send_inline=False,
+    embed_links=False,
+    send_polls=False,
+    change_info=False,
+    invite_users=False,
+    pin_messages=False,
+)
+
+
 @mcp.tool()
 async def ban_user(chat_id: int, user_id: int) -> str:
     """
@@ -1546,31 +2306,14 @@ async def ban_user(chat_id: int, user_id: int) -> str:
         user_id: User ID to ban
     """
     try:
-        chat = await client.get_entity(chat_id)
-        user = await client.get_entity(user_id)
-
-        # Create banned rights (all restrictions enabled)
-        banned_rights = ChatBannedRights(
-            until_date=None,  # Ban forever
-            view_messages=True,
-            send_messages=True,
-            send_media=True,
-            send_stickers=True,
-            send_gifs=True,
-            send_games=True,
-            send_inline=True,
-            embed_links=True,
-            send_polls=True,
-            change_info=True,
-            invite_users=True,
-            pin_messages=True,
-        )
+        chat, user = await asyncio.gather(resolve_entity(chat_id), resolve_entity(user_id))
 
         try:
-            await client(
+            await rate_limited(
                 functions.channels.EditBannedRequest(
-                    channel=chat, participant=user, banned_rights=banned_rights
-                )
+                    channel=chat, participant=user, banned_rights=BAN_RIGHTS
+                ),
+                admin_bucket,
             )
             return f"User {user_id} banned from chat {chat.title} (ID: {chat_id})."
         except telethon.errors.rpcerrorlist.UserNotMutualContactError:
@@ -1578,10 +2321,75 @@ async def ban_user(chat_id: int, user_id: int) -> str:
         except Exception as e:
             return log_and_format_error("ban_user", e, chat_id=chat_id, user_id=user_id)
     except Exception as e:
-        logger.exception(f"ban_user failed (chat_id={chat_id}, user_id={user_id})")
+        logger.exception("ban_user failed (chat_id=%s, user_id=%s)", chat_id, user_id)
         return log_and_format_error("ban_user", e, chat_id=chat_id, user_id=user_id)
 
 
+@mcp.tool()
+async def ban_users(chat_id: int, user_ids: list) -> str:
+    """
+    Ban several users from a group or channel in ordered batches.
+
+    Bans are sent in chains of up to admin_bucket.burst requests, each request taking
+    its own admin_bucket token. Within a chain Telegram runs each ban only after the
+    previous one (invokeAfterMsg), so when one ban fails every later ban in that chain
+    fails with MSG_WAIT_FAILED without having been attempted; those are re-sent in the
+    next chain rather than reported as failed.
+
+    Args:
+        chat_id: ID of the group/channel
+        user_ids: List of user IDs to ban
+    """
+    try:
+        chat, *users = await resolve_entities([chat_id, *user_ids])
+        if isinstance(chat, Exception):
+            raise chat
+
+        pending, not_found = [], []
+        for user_id, user in zip(user_ids, users):
+            if isinstance(user, Exception):
+                not_found.append(str(user_id))
+                continue
+            request = functions.channels.EditBannedRequest(
+                channel=chat, participant=user, banned_rights=BAN_RIGHTS
+            )
+            pending.append((str(user_id), request))
+
+        banned, failed = [], []
+        while pending:
+            batch, pending = pending[: admin_bucket.burst], pending[admin_bucket.burst :]
+            for _ in batch:
+                await admin_bucket.acquire()
+            # ordered=True sends the chain in one flight instead of a round-trip per user
+            try:
+                await client([request for _, request in batch], ordered=True)
+                banned.extend(uid for uid, _ in batch)
+                continue
+            except telethon.errors.MultiError as e:
+                errors = e.exceptions
+
+            retry = []
+            for position, ((uid, request), err) in enumerate(zip(batch, errors)):
+                if err is None:
+                    banned.append(uid)
+                elif isinstance(err, telethon.errors.MsgWaitFailedError) and position:
+                    # Never attempted: an earlier ban in the chain failed
+                    retry.append((uid, request))
+                else:
+                    failed.append(uid)
+                    logger.error("ban_users failed for one user in %s: %s", chat_id, err)
+            pending = retry + pending
+
+        lines = [f"Banned {len(banned)} user(s) from chat {chat.title} (ID: {chat_id})."]
+        if failed:
+            lines.append(f"Failed: {', '.join(failed)}")
+        if not_found:
+            lines.append(f"Not found: {', '.join(not_found)}")
+        return "\n".join(lines)
+    except Exception as e:
+        return log_and_format_error("ban_users", e, chat_id=chat_id, user_ids=user_ids)
+
+
 @mcp.tool()
 async def unban_user(chat_id: int, user_id: int) -> str:
     """
@@ -1592,31 +2400,14 @@ async def unban_user(chat_id: int, user_id: int) -> str:
         user_id: User ID to unban
     """
     try:
-        chat = await client.get_entity(chat_id)
-        user = await client.get_entity(user_id)
-
-        # Create unbanned rights (no restrictions)
-        unbanned_rights = ChatBannedRights(
-            until_date=None,
-            view_messages=False,
-            send_messages=False,
-            send_media=False,
-            send_stickers=False,
-            send_gifs=False,
-            send_games=False,
-            send_inline=False,
-            embed_links=False,
-            send_polls=False,
-            change_info=False,
-            invite_users=False,
-            pin_messages=False,
-        )
+        chat, user = await asyncio.gather(resolve_entity(chat_id), resolve_entity(user_id))
 
         try:
-            await client(
+            await rate_limited(
                 functions.channels.EditBannedRequest(
-                    channel=chat, participant=user, banned_rights=unbanned_rights
-                )
+                    channel=chat, participant=user, banned_rights=UNBAN_RIGHTS
+                ),
+                admin_bucket,
             )
             return f"User {user_id} unbanned from chat {chat.title} (ID: {chat_id})."
         except telethon.errors.rpcerrorlist.UserNotMutualContactError:
@@ -1624,7 +2415,7 @@ async def unban_user(chat_id: int, user_id: int) -> str:
         except Exception as e:
             return log_and_format_error("unban_user", e, chat_id=chat_id, user_id=user_id)
     except Exception as e:
-        logger.exception(f"unban_user failed (chat_id={chat_id}, user_id={user_id})")
+        logger.exception("unban_user failed (chat_id=%s, user_id=%s)", chat_id, user_id)
         return log_and_format_error("unban_user", e, chat_id=chat_id, user_id=user_id)
 
 
@@ -1635,137 +2426,156 @@ async def get_admins(chat_id: int) -> str:
     """
     try:
         # Fix: Use the correct filter type ChannelParticipantsAdmins
-        participants = await client.get_participants(chat_id, filter=ChannelParticipantsAdmins())
         lines = [
-            f"ID: {p.id}, Name: {getattr(p, 'first_name', '')} {getattr(p, 'last_name', '')}".strip()
-            for p in participants
+            format_participant_line(p)
+            async for p in client.iter_participants(chat_id, filter=ChannelParticipantsAdmins())
         ]
         return "\n".join(lines) if lines else "No admins found."
     except Exception as e:
-        logger.exception(f"get_admins failed (chat_id={chat_id})")
+        logger.exception("get_admins failed (chat_id=%s)", chat_id)
         return log_and_format_error("get_admins", e, chat_id=chat_id)
 
 
 @mcp.tool()
-async def get_banned_users(chat_id: int) -> str:
+async def get_banned_users(chat_id: int, limit: int = 1000) -> str:
     """
-    Get all banned users in a group or channel.
+    Get banned users in a group or channel.
+
+    Args:
+        chat_id: The ID of the group or channel.
+        limit: Maximum number of banned users to return.
     """
     try:
         # Fix: Use the correct filter type ChannelParticipantsKicked
-        participants = await client.get_participants(
-            chat_id, filter=ChannelParticipantsKicked(q="")
-        )
+        # Format each page as it arrives instead of materializing the full ban list
         lines = [
-            f"ID: {p.id}, Name: {getattr(p, 'first_name', '')} {getattr(p, 'last_name', '')}".strip()
-            for p in participants
+            format_participant_line(p)
+            async for p in client.iter_participants(
+                chat_id, limit=limit, filter=ChannelParticipantsKicked(q="")
+            )
         ]
         return "\n".join(lines) if lines else "No banned users found."
     except Exception as e:
-        logger.exception(f"get_banned_users failed (chat_id={chat_id})")
+        logger.exception("get_banned_users failed (chat_id=%s)", chat_id)
         return log_and_format_error("get_banned_users", e, chat_id=chat_id)
 
 
+# ExportChatInvite mints a new link on every call, so recently exported links are reused
+INVITE_LINK_CACHE_TTL = 300  # seconds
+_invite_link_cache: Dict[int, Tuple[float, str]] = {}
+
+
+async def export_invite_link(entity) -> str:
+    """Export an invite link for a group or channel, reusing one exported recently."""
+    peer_id = utils.get_peer_id(entity)
+    cached = _invite_link_cache.get(peer_id)
+    if cached is not None and time.monotonic() - cached[0] < INVITE_LINK_CACHE_TTL:
+        return cached[1]
+
+    # ExportChatInvite takes any peer, so basic groups and channels share this one request
+    result = await client(functions.messages.ExportChatInviteRequest(peer=entity))
+    link = result.link
+    _invite_link_cache[peer_id] = (time.monotonic(), link)
+    return link
+
+
 @mcp.tool()
 async def get_invite_link(chat_id: int) -> str:
     """
     Get the invite link for a group or channel.
     """
     try:
-        entity = await client.get_entity(chat_id)
+        entity = await resolve_entity(chat_id)
+        if not isinstance(entity, (Chat, Channel)):
+            return "Invite links are only available for groups and channels."
 
-        # Try using ExportChatInviteRequest first
         try:
-            from telethon.tl import functions
-
-            result = await client(functions.messages.ExportChatInviteRequest(peer=entity))
-            return result.link
-        except AttributeError:
-            # If the function doesn't exist in the current Telethon version
-            logger.warning("ExportChatInviteRequest not available, using alternative method")
-        except Exception as e1:
-            # If that fails, log and try alternative approach
-            logger.warning(f"ExportChatInviteRequest failed: {e1}")
-
-        # Alternative approach using client.export_chat_invite_link
-        try:
-            invite_link = await client.export_chat_invite_link(entity)
-            return invite_link
-        except Exception as e2:
-            logger.warning(f"export_chat_invite_link failed: {e2}")
+            return await export_invite_link(entity)
+        except Exception as export_err:
+            logger.warning("Exporting invite link failed: %s", export_err)
 
-        # Last resort: Try directly fetching chat info
+        # Fall back to the link already stored on the chat; which full-info request that
+        # takes depends on the entity type
         try:
-            if isinstance(entity, (Chat, Channel)):
-                full_chat = await client(functions.messages.GetFullChatRequest(chat_id=entity.id))
-                if hasattr(full_chat, "full_chat") and hasattr(full_chat.full_chat, "invite_link"):
-                    return full_chat.full_chat.invite_link or "No invite link available."
+            if isinstance(entity, Channel):
+                full = await client(functions.channels.GetFullChannelRequest(channel=entity))
+            else:
+                full = await client(functions.messages.GetFullChatRequest(chat_id=entity.id))
+            link = getattr(full.full_chat.exported_invite, "link", None)
+            if link:
+                return link
         except Exception as e3:
-            logger.warning(f"GetFullChatRequest failed: {e3}")
+            logger.warning("Fetching full chat info failed: %s", e3)
 
         return "Could not retrieve invite link for this chat."
     except Exception as e:
-        logger.exception(f"get_invite_link failed (chat_id={chat_id})")
+        logger.exception("get_invite_link failed (chat_id=%s)", chat_id)
         return log_and_format_error("get_invite_link", e, chat_id=chat_id)
 
 
-@mcp.tool()
-async def join_chat_by_link(link: str) -> str:
-    """
-    Join a chat by invite link.
-    """
-    try:
-        # Extract the hash from the invite link
-        if "/" in link:
-            hash_part = link.split("/")[-1]
-            if hash_part.startswith("+"):
-                hash_part = hash_part[1:]  # Remove the '+' if present
-        else:
-            hash_part = link
+# Non-member CheckChatInvite answers are reused briefly, so a retried or repeated join of
+# the same invite skips straight to the import. ChatInviteAlready is never cached: it goes
+# stale as soon as we leave the chat
+INVITE_CHECK_CACHE_TTL = 60  # seconds
+_invite_check_cache: Dict[str, Tuple[float, Any]] = {}
 
-        # Try checking the invite before joining
-        try:
-            from telethon.errors import (
-                InviteHashExpiredError,
-                InviteHashInvalidError,
-                UserAlreadyParticipantError,
-                ChatAdminRequiredError,
-                UsersTooMuchError,
-            )
 
+async def join_by_invite_hash(hash_part: str) -> str:
+    """Join a chat by invite hash, or report that we are already a member."""
+    cached = _invite_check_cache.get(hash_part)
+    if cached is not None and time.monotonic() - cached[0] < INVITE_CHECK_CACHE_TTL:
+        invite_info = cached[1]
+    else:
+        invite_info = None
+        try:
             # Try to check invite info first (will often fail if not a member)
             invite_info = await client(functions.messages.CheckChatInviteRequest(hash=hash_part))
-            if hasattr(invite_info, "chat") and invite_info.chat:
-                # If we got chat info, we're already a member
-                chat_title = getattr(invite_info.chat, "title", "Unknown Chat")
-                return f"You are already a member of this chat: {chat_title}"
-        except Exception as check_err:
+            if isinstance(invite_info, ChatInvite):
+                _invite_check_cache[hash_part] = (time.monotonic(), invite_info)
+        except Exception:
             # This often fails if not a member - just continue
             pass
+    # ChatInvitePeek also carries a chat, but only as a preview for non-members
+    if isinstance(invite_info, ChatInviteAlready):
+        chat_title = getattr(invite_info.chat, "title", "Unknown Chat")
+        return f"You are already a member of this chat: {chat_title}"
+
+    # Join the chat using the hash
+    try:
+        result = await client(functions.messages.ImportChatInviteRequest(hash=hash_part))
+        _invite_check_cache.pop(hash_part, None)
+        await invalidate_chat_list_cache()
+        if result and hasattr(result, "chats") and result.chats:
+            chat_title = getattr(result.chats[0], "title", "Unknown Chat")
+            return f"Successfully joined chat: {chat_title}"
+        return f"Joined chat via invite hash."
+    # Anything else is re-raised to the calling tool's handler
+    except telethon.errors.rpcerrorlist.InviteHashExpiredError:
+        return "The invite hash has expired and is no longer valid."
+    except telethon.errors.rpcerrorlist.InviteHashInvalidError:
+        return "The invite hash is invalid or malformed."
+    except telethon.errors.rpcerrorlist.UserAlreadyParticipantError:
+        return "You are already a member of this chat."
+    except telethon.errors.rpcerrorlist.InviteRequestSentError:
+        return "Cannot join this chat - requires admin approval. A join request was sent."
+    except telethon.errors.rpcerrorlist.UsersTooMuchError:
+        return "Cannot join this chat - it has reached maximum number of participants."
+    except telethon.errors.rpcerrorlist.ChannelsTooMuchError:
+        return "Cannot join this chat - you are already in too many channels and supergroups."
 
-        # Join the chat using the hash
-        try:
-            result = await client(functions.messages.ImportChatInviteRequest(hash=hash_part))
-            if result and hasattr(result, "chats") and result.chats:
-                chat_title = getattr(result.chats[0], "title", "Unknown Chat")
-                return f"Successfully joined chat: {chat_title}"
-            return f"Joined chat via invite hash."
-        except Exception as join_err:
-            err_str = str(join_err).lower()
-            if "expired" in err_str:
-                return "The invite hash has expired and is no longer valid."
-            elif "invalid" in err_str:
-                return "The invite hash is invalid or malformed."
-            elif "already" in err_str and "participant" in err_str:
-                return "You are already a member of this chat."
-            elif "admin" in err_str:
-                return "Cannot join this chat - requires admin approval."
-            elif "too much" in err_str or "too many" in err_str:
-                return "Cannot join this chat - it has reached maximum number of participants."
-            else:
-                raise  # Re-raise to be caught by the outer exception handler
+
+@mcp.tool()
+async def join_chat_by_link(link: str) -> str:
+    """
+    Join a chat by invite link.
+    """
+    try:
+        # Extract the hash from t.me/+HASH, t.me/joinchat/HASH or a bare hash, ignoring any
+        # trailing slash or query string
+        hash_part = link.partition("?")[0].rstrip("/").rpartition("/")[2].removeprefix("+")
+        return await join_by_invite_hash(hash_part)
     except Exception as e:
-        logger.exception(f"join_chat_by_link failed (link={link})")
+        logger.exception("join_chat_by_link failed (link=%s)", link)
         return log_and_format_error("join_chat_by_link", e, link=link)
 
 
@@ -1775,30 +2585,10 @@ async def export_chat_invite(chat_id: int) -> str:
     Export a chat invite link.
     """
     try:
-        entity = await client.get_entity(chat_id)
-
-        # Try using ExportChatInviteRequest first
-        try:
-            from telethon.tl import functions
-
-            result = await client(functions.messages.ExportChatInviteRequest(peer=entity))
-            return result.link
-        except AttributeError:
-            # If the function doesn't exist in the current Telethon version
-            logger.warning("ExportChatInviteRequest not available, using alternative method")
-        except Exception as e1:
-            # If that fails, log and try alternative approach
-            logger.warning(f"ExportChatInviteRequest failed: {e1}")
-
-        # Alternative approach using client.export_chat_invite_link
-        try:
-            invite_link = await client.export_chat_invite_link(entity)
-            return invite_link
-        except Exception as e2:
-            logger.warning(f"export_chat_invite_link failed: {e2}")
-            return log_and_format_error("export_chat_invite", e2, chat_id=chat_id)
+        entity = await resolve_entity(chat_id)
+        return await export_invite_link(entity)
     except Exception as e:
-        logger.exception(f"export_chat_invite failed (chat_id={chat_id})")
+        logger.exception("export_chat_invite failed (chat_id=%s)", chat_id)
         return log_and_format_error("export_chat_invite", e, chat_id=chat_id)
 
 
@@ -1809,52 +2599,9 @@ async def import_chat_invite(hash: str) -> str:
     """
     try:
         # Remove any prefixes like '+' if present
-        if hash.startswith("+"):
-            hash = hash[1:]
-
-        # Try checking the invite before joining
-        try:
-            from telethon.errors import (
-                InviteHashExpiredError,
-                InviteHashInvalidError,
-                UserAlreadyParticipantError,
-                ChatAdminRequiredError,
-                UsersTooMuchError,
-            )
-
-            # Try to check invite info first (will often fail if not a member)
-            invite_info = await client(functions.messages.CheckChatInviteRequest(hash=hash))
-            if hasattr(invite_info, "chat") and invite_info.chat:
-                # If we got chat info, we're already a member
-                chat_title = getattr(invite_info.chat, "title", "Unknown Chat")
-                return f"You are already a member of this chat: {chat_title}"
-        except Exception as check_err:
-            # This often fails if not a member - just continue
-            pass
-
-        # Join the chat using the hash
-        try:
-            result = await client(functions.messages.ImportChatInviteRequest(hash=hash))
-            if result and hasattr(result, "chats") and result.chats:
-                chat_title = getattr(result.chats[0], "title", "Unknown Chat")
-                return f"Successfully joined chat: {chat_title}"
-            return f"Joined chat via invite hash."
-        except Exception as join_err:
-            err_str = str(join_err).lower()
-            if "expired" in err_str:
-                return "The invite hash has expired and is no longer valid."
-            elif "invalid" in err_str:
-                return "The invite hash is invalid or malformed."
-            elif "already" in err_str and "participant" in err_str:
-                return "You are already a member of this chat."
-            elif "admin" in err_str:
-                return "Cannot join this chat - requires admin approval."
-            elif "too much" in err_str or "too many" in err_str:
-                return "Cannot join this chat - it has reached maximum number of participants."
-            else:
-                raise  # Re-raise to be caught by the outer exception handler
+        return await join_by_invite_hash(hash.removeprefix("+"))
     except Exception as e:
-        logger.exception(f"import_chat_invite failed (hash={hash})")
+        logger.exception("import_chat_invite failed (hash=%s)", hash)
         return log_and_format_error("import_chat_invite", e, hash=hash)
 
 
@@ -1867,22 +2614,17 @@ async def send_voice(chat_id: int, file_path: str) -> str:
         file_path: Absolute path to the OGG/OPUS file.
     """
     try:
-        if not os.path.isfile(file_path):
+        problem = await check_readable_file(file_path)
+        if problem == "missing":
             return f"File not found: {file_path}"
-        if not os.access(file_path, os.R_OK):
+        if problem == "unreadable":
             return f"File is not readable: {file_path}"
-        mime, _ = mimetypes.guess_type(file_path)
-        if not (
-            mime
-            and (
-                mime == "audio/ogg"
-                or file_path.lower().endswith(".ogg")
-                or file_path.lower().endswith(".opus")
-            )
-        ):
-            return "Voice file must be .ogg or .opus format."
-        entity = await client.get_entity(chat_id)
+        if os.path.splitext(file_path)[1].lower() not in VOICE_EXTENSIONS:
+            return f"Voice file must be one of: {', '.join(sorted(VOICE_EXTENSIONS))}."
+        entity = await resolve_entity(chat_id)
+        await request_bucket.acquire()
         await client.send_file(entity, file_path, voice_note=True)
+        await invalidate_chat_list_cache()
         return f"Voice message sent to chat {chat_id}."
     except Exception as e:
         return log_and_format_error("send_voice", e, chat_id=chat_id, file_path=file_path)
@@ -1894,9 +2636,12 @@ async def forward_message(from_chat_id: int, message_id: int, to_chat_id: int) -
     Forward a message from one chat to another.
     """
     try:
-        from_entity = await client.get_entity(from_chat_id)
-        to_entity = await client.get_entity(to_chat_id)
+        from_entity, to_entity = await asyncio.gather(
+            client.get_input_entity(from_chat_id), client.get_input_entity(to_chat_id)
+        )
+        await request_bucket.acquire()
         await client.forward_messages(to_entity, message_id, from_entity)
+        await invalidate_chat_list_cache()
         return f"Message {message_id} forwarded from {from_chat_id} to {to_chat_id}."
     except Exception as e:
         return log_and_format_error(
@@ -1914,7 +2659,7 @@ async def edit_message(chat_id: int, message_id: int, new_text: str) -> str:
     Edit a message you sent.
     """
     try:
-        entity = await client.get_entity(chat_id)
+        entity = await client.get_input_entity(chat_id)
         await client.edit_message(entity, message_id, new_text)
         return f"Message {message_id} edited."
     except Exception as e:
@@ -1929,8 +2674,9 @@ async def delete_message(chat_id: int, message_id: int) -> str:
     Delete a message by ID.
     """
     try:
-        entity = await client.get_entity(chat_id)
+        entity = await client.get_input_entity(chat_id)
         await client.delete_messages(entity, message_id)
+        await invalidate_chat_list_cache()
         return f"Message {message_id} deleted."
     except Exception as e:
         return log_and_format_error("delete_message", e, chat_id=chat_id, message_id=message_id)
@@ -1942,7 +2688,7 @@ async def pin_message(chat_id: int, message_id: int) -> str:
     Pin a message in a chat.
     """
     try:
-        entity = await client.get_entity(chat_id)
+        entity = await client.get_input_entity(chat_id)
         await client.pin_message(entity, message_id)
         return f"Message {message_id} pinned in chat {chat_id}."
     except Exception as e:
@@ -1955,7 +2701,7 @@ async def unpin_message(chat_id: int, message_id: int) -> str:
     Unpin a message in a chat.
     """
     try:
-        entity = await client.get_entity(chat_id)
+        entity = await client.get_input_entity(chat_id)
         await client.unpin_message(entity, message_id)
         return f"Message {message_id} unpinned in chat {chat_id}."
     except Exception as e:
@@ -1968,8 +2714,9 @@ async def mark_as_read(chat_id: int) -> str:
     Mark all messages as read in a chat.
     """
     try:
-        entity = await client.get_entity(chat_id)
+        entity = await client.get_input_entity(chat_id)
         await client.send_read_acknowledge(entity)
+        await invalidate_chat_list_cache()
         return f"Marked all messages as read in chat {chat_id}."
     except Exception as e:
         return log_and_format_error("mark_as_read", e, chat_id=chat_id)
@@ -1981,8 +2728,10 @@ async def reply_to_message(chat_id: int, message_id: int, text: str) -> str:
     Reply to a specific message in a chat.
     """
     try:
-        entity = await client.get_entity(chat_id)
+        entity = await client.get_input_entity(chat_id)
+        await request_bucket.acquire()
         await client.send_message(entity, text, reply_to=message_id)
+        await invalidate_chat_list_cache()
         return f"Replied to message {message_id} in chat {chat_id}."
     except Exception as e:
         return log_and_format_error(
@@ -1990,6 +2739,55 @@ async def reply_to_message(chat_id: int, message_id: int, text: str) -> str:
         )
 
 
+# Single-message lookups for the same chat that arrive within this window share one
+# get_messages(ids=[...]) call
+MESSAGE_FETCH_BATCH_WINDOW = 0.01  # seconds
+_pending_message_fetches: Dict[int, Tuple[Any, List[Tuple[int, asyncio.Future]]]] = {}
+_message_fetch_flushes: set = set()
+
+
+async def _flush_message_fetches(peer_id: int) -> None:
+    batch: List[Tuple[int, asyncio.Future]] = []
+    outcomes: List[Any] = []
+    try:
+        await asyncio.sleep(MESSAGE_FETCH_BATCH_WINDOW)
+        entity, batch = _pending_message_fetches.pop(peer_id)
+        messages = await client.get_messages(entity, ids=[msg_id for msg_id, _ in batch])
+        outcomes = list(messages)
+    except BaseException as e:
+        # Cancelled or failed; callers must not wait forever
+        if not batch:
+            batch = _pending_message_fetches.pop(peer_id, (None, []))[1]
+        outcomes = [e] * len(batch)
+        if not isinstance(e, Exception):
+            raise
+    finally:
+        for (_, future), outcome in zip(batch, outcomes):
+            if future.done():
+                continue
+            if isinstance(outcome, asyncio.CancelledError):
+                future.cancel()
+            elif isinstance(outcome, BaseException):
+                future.set_exception(outcome)
+            else:
+                future.set_result(outcome)
+
+
+async def get_message_batched(entity, message_id: int):
+    """Fetch one message (or None), coalescing concurrent lookups in the same chat."""
+    future = asyncio.get_running_loop().create_future()
+    peer_id = utils.get_peer_id(entity)
+    pending = _pending_message_fetches.get(peer_id)
+    if pending is None:
+        _pending_message_fetches[peer_id] = (entity, [(message_id, future)])
+        task = asyncio.create_task(_flush_message_fetches(peer_id))
+        _message_fetch_flushes.add(task)
+        task.add_done_callback(_message_fetch_flushes.discard)
+    else:
+        pending[1].append((message_id, future))
+    return await future
+
+
 @mcp.tool()
 async def get_media_info(chat_id: int, message_id: int) -> str:
     """
@@ -1999,8 +2797,8 @@ async def get_media_info(chat_id: int, message_id: int) -> str:
         message_id: The message ID.
     """
     try:
-        entity = await client.get_entity(chat_id)
-        msg = await client.get_messages(entity, ids=message_id)
+        entity = await client.get_input_entity(chat_id)
+        msg = await get_message_batched(entity, message_id)
         if not msg or not msg.media:
             return "No media found in the specified message."
         return str(msg.media)
@@ -2015,7 +2813,7 @@ async def search_public_chats(query: str) -> str:
     """
     try:
         result = await client(functions.contacts.SearchRequest(q=query, limit=20))
-        return json.dumps([format_entity(u) for u in result.users], indent=2)
+        return format_json([format_entity(u) for u in result.users])
     except Exception as e:
         return log_and_format_error("search_public_chats", e, query=query)
 
@@ -2026,9 +2824,13 @@ async def search_messages(chat_id: int, query: str, limit: int = 20) -> str:
     Search for messages in a chat by text.
     """
     try:
-        entity = await client.get_entity(chat_id)
-        messages = await client.get_messages(entity, limit=limit, search=query)
-        return "\n".join([f"ID: {m.id} | {m.date} | {m.message}" for m in messages])
+        entity = await client.get_input_entity(chat_id)
+        return "\n".join(
+            [
+                f"ID: {m.id} | {m.date} | {m.message}"
+                async for m in client.iter_messages(entity, limit=limit, search=query)
+            ]
+        )
     except Exception as e:
         return log_and_format_error(
             "search_messages", e, chat_id=chat_id, query=query, limit=limit
@@ -2053,9 +2855,8 @@ async def mute_chat(chat_id: int) -> str:
     Mute notifications for a chat.
     """
     try:
-        from telethon.tl.types import InputPeerNotifySettings
 
-        peer = await client.get_entity(chat_id)
+        peer = await resolve_entity(chat_id)
         await client(
             functions.account.UpdateNotifySettingsRequest(
                 peer=peer, settings=InputPeerNotifySettings(mute_until=2**31 - 1)
@@ -2078,10 +2879,10 @@ async def mute_chat(chat_id: int) -> str:
             )
             return f"Chat {chat_id} muted (using alternative method)."
         except Exception as alt_e:
-            logger.exception(f"mute_chat (alt method) failed (chat_id={chat_id})")
+            logger.exception("mute_chat (alt method) failed (chat_id=%s)", chat_id)
             return log_and_format_error("mute_chat", alt_e, chat_id=chat_id)
     except Exception as e:
-        logger.exception(f"mute_chat failed (chat_id={chat_id})")
+        logger.exception("mute_chat failed (chat_id=%s)", chat_id)
         return log_and_format_error("mute_chat", e, chat_id=chat_id)
 
 
@@ -2091,9 +2892,8 @@ async def unmute_chat(chat_id: int) -> str:
     Unmute notifications for a chat.
     """
     try:
-        from telethon.tl.types import InputPeerNotifySettings
 
-        peer = await client.get_entity(chat_id)
+        peer = await resolve_entity(chat_id)
         await client(
             functions.account.UpdateNotifySettingsRequest(
                 peer=peer, settings=InputPeerNotifySettings(mute_until=0)
@@ -2116,10 +2916,10 @@ async def unmute_chat(chat_id: int) -> str:
             )
             return f"Chat {chat_id} unmuted (using alternative method)."
         except Exception as alt_e:
-            logger.exception(f"unmute_chat (alt method) failed (chat_id={chat_id})")
+            logger.exception("unmute_chat (alt method) failed (chat_id=%s)", chat_id)
             return log_and_format_error("unmute_chat", alt_e, chat_id=chat_id)
     except Exception as e:
-        logger.exception(f"unmute_chat failed (chat_id={chat_id})")
+        logger.exception("unmute_chat failed (chat_id=%s)", chat_id)
         return log_and_format_error("unmute_chat", e, chat_id=chat_id)
 
 
@@ -2131,9 +2931,10 @@ async def archive_chat(chat_id: int) -> str:
     try:
         await client(
             functions.messages.ToggleDialogPinRequest(
-                peer=await client.get_entity(chat_id), pinned=True
+                peer=await resolve_entity(chat_id), pinned=True
             )
         )
+        await invalidate_chat_list_cache()
         return f"Chat {chat_id} archived."
     except Exception as e:
         return log_and_format_error("archive_chat", e, chat_id=chat_id)
@@ -2147,22 +2948,34 @@ async def unarchive_chat(chat_id: int) -> str:
     try:
         await client(
             functions.messages.ToggleDialogPinRequest(
-                peer=await client.get_entity(chat_id), pinned=False
+                peer=await resolve_entity(chat_id), pinned=False
             )
         )
+        await invalidate_chat_list_cache()
         return f"Chat {chat_id} unarchived."
     except Exception as e:
         return log_and_format_error("unarchive_chat", e, chat_id=chat_id)
 
 
+# Last sticker set listing and the hash Telegram sent with it; passing the hash back
+# makes the server answer AllStickersNotModified when nothing changed.
+_sticker_sets_cache: Dict[str, Any] = {"hash": 0, "payload": None}
+
+
 @mcp.tool()
 async def get_sticker_sets() -> str:
     """
     Get all sticker sets.
     """
     try:
-        result = await client(functions.messages.GetAllStickersRequest(hash=0))
-        return json.dumps([s.title for s in result.sets], indent=2)
+        result = await client(
+            functions.messages.GetAllStickersRequest(hash=_sticker_sets_cache["hash"])
+        )
+        if isinstance(result, AllStickersNotModified):
+            return _sticker_sets_cache["payload"]
+        payload = format_json([s.title for s in result.sets])
+        _sticker_sets_cache.update(hash=result.hash, payload=payload)
+        return payload
     except Exception as e:
         return log_and_format_error("get_sticker_sets", e)
 
@@ -2176,14 +2989,17 @@ async def send_sticker(chat_id: int, file_path: str) -> str:
         file_path: Absolute path to the .webp sticker file.
     """
     try:
-        if not os.path.isfile(file_path):
+        problem = await check_readable_file(file_path)
+        if problem == "missing":
             return f"Sticker file not found: {file_path}"
-        if not os.access(file_path, os.R_OK):
+        if problem == "unreadable":
             return f"Sticker file is not readable: {file_path}"
         if not file_path.lower().endswith(".webp"):
             return "Sticker file must be a .webp file."
-        entity = await client.get_entity(chat_id)
+        entity = await resolve_entity(chat_id)
+        await request_bucket.acquire()
         await client.send_file(entity, file_path, force_document=False)
+        await invalidate_chat_list_cache()
         return f"Sticker sent to chat {chat_id}."
     except Exception as e:
         return log_and_format_error("send_sticker", e, chat_id=chat_id, file_path=file_path)
@@ -2205,13 +3021,10 @@ async def get_gif_search(query: str, limit: int = 10) -> str:
             )
             if not result.gifs:
                 return "[]"
-            return json.dumps(
-                [g.document.id for g in result.gifs], indent=2, default=json_serializer
-            )
+            return format_json([g.document.id for g in result.gifs])
         except (AttributeError, ImportError):
             # Fallback approach: Use SearchRequest with GIF filter
             try:
-                from telethon.tl.types import InputMessagesFilterGif
 
                 result = await client(
                     functions.messages.SearchRequest(
@@ -2235,12 +3048,12 @@ async def get_gif_search(query: str, limit: int = 10) -> str:
                 for msg in result.messages:
                     if hasattr(msg, "media") and msg.media and hasattr(msg.media, "document"):
                         gif_ids.append(msg.media.document.id)
-                return json.dumps(gif_ids, default=json_serializer)
+                return format_json(gif_ids)
             except Exception as inner_e:
                 # Last resort: Try to fetch from a public bot
                 return f"Could not search GIFs using available methods: {inner_e}"
     except Exception as e:
-        logger.exception(f"get_gif_search failed (query={query}, limit={limit})")
+        logger.exception("get_gif_search failed (query=%s, limit=%s)", query, limit)
         return log_and_format_error("get_gif_search", e, query=query, limit=limit)
 
 
@@ -2255,8 +3068,10 @@ async def send_gif(chat_id: int, gif_id: int) -> str:
     try:
         if not isinstance(gif_id, int):
             return "gif_id must be a Telegram document ID (integer), not a file path. Use get_gif_search to find IDs."
-        entity = await client.get_entity(chat_id)
+        entity = await resolve_entity(chat_id)
+        await request_bucket.acquire()
         await client.send_file(entity, gif_id)
+        await invalidate_chat_list_cache()
         return f"GIF sent to chat {chat_id}."
     except Exception as e:
         return log_and_format_error("send_gif", e, chat_id=chat_id, gif_id=gif_id)
@@ -2268,34 +3083,33 @@ async def get_bot_info(bot_username: str) -> str:
     Get information about a bot by username.
     """
     try:
-        entity = await client.get_entity(bot_username)
+        entity = await resolve_entity(bot_username)
         if not entity:
             return f"Bot with username {bot_username} not found."
 
         result = await client(functions.users.GetFullUserRequest(id=entity))
-
-        # Create a more structured, serializable response
-        if hasattr(result, "to_dict"):
-            # Use custom serializer to handle non-serializable types
-            return json.dumps(result.to_dict(), indent=2, default=json_serializer)
-        else:
-            # Fallback if to_dict is not available
-            info = {
-                "bot_info": {
-                    "id": entity.id,
-                    "username": entity.username,
-                    "first_name": entity.first_name,
-                    "last_name": getattr(entity, "last_name", ""),
-                    "is_bot": getattr(entity, "bot", False),
-                    "verified": getattr(entity, "verified", False),
-                }
-            }
-            if hasattr(result, "full_user") and hasattr(result.full_user, "about"):
-                info["bot_info"]["about"] = result.full_user.about
-
-            return json.dumps(info, indent=2)
-    except Exception as e:
-        logger.exception(f"get_bot_info failed (bot_username={bot_username})")
+        full_user = result.full_user
+
+        # Pick the fields callers use instead of dumping the whole UserFull tree via to_dict()
+        info = {
+            "id": entity.id,
+            "username": entity.username,
+            "first_name": entity.first_name,
+            "last_name": entity.last_name or "",
+            "is_bot": bool(entity.bot),
+            "verified": bool(entity.verified),
+            "about": full_user.about,
+        }
+        bot_info = full_user.bot_info
+        if bot_info:
+            info["description"] = bot_info.description
+            info["commands"] = [
+                {"command": c.command, "description": c.description}
+                for c in bot_info.commands or []
+            ]
+        return format_json({"bot_info": info})
+    except Exception as e:
+        logger.exception("get_bot_info failed (bot_username=%s)", bot_username)
         return log_and_format_error("get_bot_info", e, bot_username=bot_username)
 
 
@@ -2312,25 +3126,21 @@ async def set_bot_commands(bot_username: str, commands: list) -> str:
     """
     try:
         # First check if the current client is a bot
-        me = await client.get_me()
+        me = await get_me_cached()
         if not getattr(me, "bot", False):
             return "Error: This function can only be used by bot accounts. Your current Telegram account is a regular user account, not a bot."
 
-        # Import required types
-        from telethon.tl.types import BotCommand, BotCommandScopeDefault
-        from telethon.tl.functions.bots import SetBotCommandsRequest
-
         # Create BotCommand objects from the command dictionaries
         bot_commands = [
             BotCommand(command=c["command"], description=c["description"]) for c in commands
         ]
 
         # Get the bot entity
-        bot = await client.get_entity(bot_username)
+        bot = await resolve_entity(bot_username)
 
         # Set the commands with proper scope
         await client(
-            SetBotCommandsRequest(
+            functions.bots.SetBotCommandsRequest(
                 scope=BotCommandScopeDefault(),
                 lang_code="en",  # Default language code
                 commands=bot_commands,
@@ -2339,10 +3149,10 @@ async def set_bot_commands(bot_username: str, commands: list) -> str:
 
         return f"Bot commands set for {bot_username}."
     except ImportError as ie:
-        logger.exception(f"set_bot_commands failed - ImportError: {ie}")
+        logger.exception("set_bot_commands failed - ImportError: %s", ie)
         return log_and_format_error("set_bot_commands", ie)
     except Exception as e:
-        logger.exception(f"set_bot_commands failed (bot_username={bot_username})")
+        logger.exception("set_bot_commands failed (bot_username=%s)", bot_username)
         return log_and_format_error("set_bot_commands", e, bot_username=bot_username)
 
 
@@ -2352,9 +3162,14 @@ async def get_history(chat_id: int, limit: int = 100) -> str:
     Get full chat history (up to limit).
     """
     try:
-        entity = await client.get_entity(chat_id)
-        messages = await client.get_messages(entity, limit=limit)
-        return "\n".join([f"ID: {m.id} | {m.date} | {m.message}" for m in messages])
+        entity = await resolve_entity(chat_id)
+        # Format while iterating so long histories never hold every Message object at once
+        return "\n".join(
+            [
+                f"ID: {m.id} | {m.date} | {m.message}"
+                async for m in client.iter_messages(entity, limit=limit)
+            ]
+        )
     except Exception as e:
         return log_and_format_error("get_history", e, chat_id=chat_id, limit=limit)
 
@@ -2365,11 +3180,11 @@ async def get_user_photos(user_id: int, limit: int = 10) -> str:
     Get profile photos of a user.
     """
     try:
-        user = await client.get_entity(user_id)
+        user = await client.get_input_entity(user_id)
         photos = await client(
             functions.photos.GetUserPhotosRequest(user_id=user, offset=0, max_id=0, limit=limit)
         )
-        return json.dumps([p.id for p in photos.photos], indent=2)
+        return format_json([p.id for p in photos.photos])
     except Exception as e:
         return log_and_format_error("get_user_photos", e, user_id=user_id, limit=limit)
 
@@ -2380,6 +3195,7 @@ async def get_user_status(user_id: int) -> str:
     Get the online status of a user.
     """
     try:
+        # Deliberately uncached: status changes far faster than the entity cache TTL
         user = await client.get_entity(user_id)
         return str(user.status)
     except Exception as e:
@@ -2401,10 +3217,15 @@ async def get_recent_actions(chat_id: int) -> str:
         if not result or not result.events:
             return "No recent admin actions found."
 
-        # Use the custom serializer to handle datetime objects
-        return json.dumps([e.to_dict() for e in result.events], indent=2, default=json_serializer)
+        # Only the action itself needs the generic to_dict() walk
+        return format_json(
+            [
+                {"id": e.id, "date": e.date, "user_id": e.user_id, "action": e.action.to_dict()}
+                for e in result.events
+            ]
+        )
     except Exception as e:
-        logger.exception(f"get_recent_actions failed (chat_id={chat_id})")
+        logger.exception("get_recent_actions failed (chat_id=%s)", chat_id)
         return log_and_format_error("get_recent_actions", e, chat_id=chat_id)
 
 
@@ -2414,26 +3235,20 @@ async def get_pinned_messages(chat_id: int) -> str:
     Get all pinned messages in a chat.
     """
     try:
-        entity = await client.get_entity(chat_id)
-        # Use correct filter based on Telethon version
-        try:
-            # Try newer Telethon approach
-            from telethon.tl.types import InputMessagesFilterPinned
-
-            messages = await client.get_messages(entity, filter=InputMessagesFilterPinned())
-        except (ImportError, AttributeError):
-            # Fallback - try without filter and manually filter pinned
-            all_messages = await client.get_messages(entity, limit=50)
-            messages = [m for m in all_messages if getattr(m, "pinned", False)]
-
-        if not messages:
+        entity = await client.get_input_entity(chat_id)
+        # The server filters pinned messages; get_messages() without a limit would stop
+        # after the first one, so iterate over all of them
+        lines = [
+            f"ID: {m.id} | {m.date} | {m.message or '[Media/No text]'}"
+            async for m in client.iter_messages(
+                entity, limit=None, filter=InputMessagesFilterPinned()
+            )
+        ]
+        if not lines:
             return "No pinned messages found in this chat."
-
-        return "\n".join(
-            [f"ID: {m.id} | {m.date} | {m.message or '[Media/No text]'}" for m in messages]
-        )
+        return "\n".join(lines)
     except Exception as e:
-        logger.exception(f"get_pinned_messages failed (chat_id={chat_id})")
+        logger.exception("get_pinned_messages failed (chat_id=%s)", chat_id)
         return log_and_format_error("get_pinned_messages", e, chat_id=chat_id)
 
 
@@ -2443,18 +3258,18 @@ if __name__ == "__main__":
     async def main() -> None:
         try:
             # Start the Telethon client non-interactively
-            print("Starting Telegram client...")
+            # (log to stderr: stdout is reserved for the MCP stdio transport)
+            logger.info("Starting Telegram client...")
             await client.start()
 
-            print("Telegram client started. Running MCP server...")
+            logger.info("Telegram client started. Running MCP server...")
             # Use the asynchronous entrypoint instead of mcp.run()
             await mcp.run_stdio_async()
         except Exception as e:
-            print(f"Error starting client: {e}", file=sys.stderr)
+            logger.error("Error starting client: %s", e)
             if isinstance(e, sqlite3.OperationalError) and "database is locked" in str(e):
-                print(
-                    "Database lock detected. Please ensure no other instances are running.",
-                    file=sys.stderr,
+                logger.error(
+                    "Database lock detected. Please ensure no other instances are running."
                 )
             sys.exit(1)
 